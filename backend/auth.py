@@ -1,32 +1,207 @@
 from __future__ import annotations
 
+import base64
 import hashlib
+import hmac
+import os
 import secrets
-from datetime import datetime, timedelta
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 from fastapi import Depends, Header, HTTPException, status
 
+from cache import TTLCache
 from database import DatabaseManager, get_database_manager
 from schemas import UserCreate, UserLogin
 
+# The token cache lives in each worker process, so a logout or re-login served
+# by one worker only reaches the others once their entries expire. Keep the TTL
+# short enough that a revoked token stops working within a few seconds.
+TOKEN_CACHE_TTL_SECONDS = 5
+
+_SQL_USER_EXISTS = """
+    SELECT id FROM users WHERE username = ?
+    UNION ALL
+    SELECT id FROM users WHERE email = ?
+    LIMIT 1
+"""
+_SQL_INSERT_USER = """
+    INSERT INTO users (username, email, password_hash, created_at)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_FIND_USER = """
+    SELECT id, username, email, password_hash, role, created_at
+    FROM users
+    WHERE username = ?
+    UNION ALL
+    SELECT id, username, email, password_hash, role, created_at
+    FROM users
+    WHERE email = ?
+    LIMIT 1
+"""
+_SQL_UPDATE_PASSWORD_HASH = "UPDATE users SET password_hash = ? WHERE id = ?"
+_SQL_UPSERT_TOKEN = """
+    INSERT INTO tokens (user_id, token, created_at) VALUES (?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET token = excluded.token, created_at = excluded.created_at
+"""
+_SQL_VALIDATE_TOKEN = """
+    SELECT users.id, users.username, users.email, users.role, users.created_at
+    FROM tokens
+    INNER JOIN users ON users.id = tokens.user_id
+    WHERE tokens.token = ? AND tokens.created_at > ?
+"""
+_SQL_DELETE_TOKEN = "DELETE FROM tokens WHERE token = ?"
+_SQL_PURGE_EXPIRED_TOKENS = "DELETE FROM tokens WHERE created_at < ?"
+
+
+@lru_cache(maxsize=8)
+def _format_utc(epoch_seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(epoch_seconds))
+
+
+def _iso_now() -> str:
+    """UTC now as ``YYYY-MM-DDTHH:MM:SS``, formatted at most once per second."""
+    return _format_utc(int(time.time()))
+
 
 class TokenManager:
-    """Handles token generation and expiration checks."""
+    """Issues HMAC-signed tokens and checks their signature and expiration.
+
+    Tokens have the form ``<user_id>.<issued_at>.<nonce>.<signature>`` so that
+    forged or expired tokens are rejected without touching the database.
+    """
 
-    def __init__(self, ttl_hours: int = 24) -> None:
+    def __init__(self, secret: bytes, ttl_hours: int = 24) -> None:
+        self.secret = secret
         self.ttl = timedelta(hours=ttl_hours)
 
-    def generate_token(self) -> str:
-        return secrets.token_urlsafe(32)
+    def _sign(self, payload: str) -> bytes:
+        digest = hmac.new(self.secret, payload.encode("utf-8"), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=")
+
+    def generate_token(self, user_id: int) -> str:
+        payload = f"{user_id}.{int(time.time())}.{secrets.token_urlsafe(8)}"
+        return f"{payload}.{self._sign(payload).decode('ascii')}"
+
+    def read_token(self, token: str) -> Optional[tuple[int, int]]:
+        """Return ``(user_id, issued_at)`` if the token signature is valid."""
+        payload, _, signature = token.rpartition(".")
+        if not payload or not hmac.compare_digest(signature.encode("utf-8"), self._sign(payload)):
+            return None
+        try:
+            user_id, issued_at, _nonce = payload.split(".")
+            return int(user_id), int(issued_at)
+        except ValueError:
+            return None
+
+    def seconds_until_expiry(self, issued_at: int) -> float:
+        return issued_at + self.ttl.total_seconds() - time.time()
+
+    def is_token_expired(self, issued_at: int) -> bool:
+        return self.seconds_until_expiry(issued_at) <= 0
+
+
+_MIN_SECRET_BYTES = 32
+
+
+def _checked_secret(secret: bytes, source: str) -> bytes:
+    if len(secret) < _MIN_SECRET_BYTES:
+        raise RuntimeError(f"Token secret from {source} must be at least {_MIN_SECRET_BYTES} bytes.")
+    return secret
+
 
-    def is_token_expired(self, created_at: str) -> bool:
-        token_time = datetime.fromisoformat(created_at)
-        return datetime.utcnow() - token_time > self.ttl
+def _read_key_file(key_file: Path) -> bytes:
+    try:
+        secret = bytes.fromhex(key_file.read_text().strip())
+    except ValueError:
+        raise RuntimeError(f"Token secret file {key_file} is not valid hex.") from None
+    return _checked_secret(secret, str(key_file))
+
+
+def load_token_secret(path: str = "token_secret.key") -> bytes:
+    """Read the token signing key from FITNESS_TOKEN_SECRET or a local key file."""
+    env_secret = os.environ.get("FITNESS_TOKEN_SECRET")
+    if env_secret is not None:
+        return _checked_secret(env_secret.encode("utf-8"), "FITNESS_TOKEN_SECRET")
+
+    key_file = Path(path)
+    if key_file.exists():
+        return _read_key_file(key_file)
+
+    # The key is written in full to a temp file and then published with a hard
+    # link, which fails instead of overwriting. Concurrent workers therefore never
+    # read a partly written file, and they all end up using the winner's key.
+    secret = secrets.token_bytes(_MIN_SECRET_BYTES)
+    fd, temp_name = tempfile.mkstemp(dir=key_file.parent, prefix=f".{key_file.name}.")
+    try:
+        with os.fdopen(fd, "w") as handle:
+            handle.write(secret.hex())
+        os.link(temp_name, key_file)
+    except FileExistsError:
+        return _read_key_file(key_file)
+    finally:
+        os.unlink(temp_name)
+    return secret
+
+
+# hashlib.new goes through OpenSSL's EVP interface, which uses the CPU's SHA
+# extensions (SHA-NI) when available. Requires OpenSSL >= 1.1.1.
+_sha256 = hashlib.new
+
+_SCRYPT_N = 2**14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+_SCRYPT_PREFIX = f"scrypt${_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}$"
 
 
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+    """Return a salted scrypt hash as ``scrypt$n$r$p$salt$digest``."""
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=_SCRYPT_N,
+        r=_SCRYPT_R,
+        p=_SCRYPT_P,
+        dklen=32,
+    )
+    return f"{_SCRYPT_PREFIX}{salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    if not password_hash.startswith("scrypt$"):
+        # Legacy unsalted SHA-256 hex digest.
+        legacy_hash = _sha256("sha256", password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(password_hash, legacy_hash)
+
+    try:
+        _, n, r, p, salt_hex, digest_hex = password_hash.split("$")
+        expected = bytes.fromhex(digest_hex)
+        candidate = hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=bytes.fromhex(salt_hex),
+            n=int(n),
+            r=int(r),
+            p=int(p),
+            dklen=len(expected),
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate, expected)
+
+
+# Checked against when no user matches, so unknown logins cost one scrypt
+# run just like a wrong password and response times do not reveal accounts.
+_DUMMY_HASH = hash_password(secrets.token_urlsafe(16))
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    return not password_hash.startswith(_SCRYPT_PREFIX)
 
 
 class AuthService:
@@ -35,10 +210,15 @@ class AuthService:
     def __init__(self, db_manager: DatabaseManager, token_manager: TokenManager) -> None:
         self.db = db_manager
         self.token_manager = token_manager
+        # token -> validated user, so authenticated requests skip the DB lookup.
+        self._token_cache = TTLCache(maxsize=100_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+        # user_id -> tokens cached for that user, so re-login evicts them without a full scan.
+        self._user_tokens: dict[int, set[str]] = {}
+        self._user_tokens_lock = threading.Lock()
 
     def create_user(self, user_data: UserCreate) -> dict:
         existing_user = self.db.execute(
-            "SELECT id FROM users WHERE username = ? OR email = ?",
+            _SQL_USER_EXISTS,
             (user_data.username, user_data.email),
             fetchone=True,
         )
@@ -48,12 +228,9 @@ class AuthService:
                 detail="Username or email already exists.",
             )
 
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = _iso_now()
         self.db.execute(
-            """
-            INSERT INTO users (username, email, password_hash, created_at)
-            VALUES (?, ?, ?, ?)
-            """,
+            _SQL_INSERT_USER,
             (
                 user_data.username,
                 user_data.email,
@@ -66,26 +243,30 @@ class AuthService:
 
     def authenticate_user(self, credentials: UserLogin) -> dict:
         user = self.db.execute(
-            """
-            SELECT id, username, email, password_hash, role, created_at
-            FROM users
-            WHERE username = ? OR email = ?
-            """,
+            _SQL_FIND_USER,
             (credentials.username_or_email, credentials.username_or_email),
             fetchone=True,
         )
         if not user:
+            verify_password(credentials.password, _DUMMY_HASH)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials.",
             )
 
-        if user["password_hash"] != hash_password(credentials.password):
+        if not verify_password(credentials.password, user["password_hash"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials.",
             )
 
+        if password_needs_rehash(user["password_hash"]):
+            self.db.execute(
+                _SQL_UPDATE_PASSWORD_HASH,
+                (hash_password(credentials.password), user["id"]),
+                commit=True,
+            )
+
         token = self.generate_token(user["id"])
         return {
             "token": token,
@@ -95,54 +276,85 @@ class AuthService:
         }
 
     def generate_token(self, user_id: int) -> str:
-        # Keep one active token per user for predictable session behavior.
-        self.db.execute("DELETE FROM tokens WHERE user_id = ?", (user_id,), commit=True)
-
-        token = self.token_manager.generate_token()
-        created_at = datetime.utcnow().isoformat(timespec="seconds")
-
+        # Keep one active token per user for predictable session behavior:
+        # the upsert replaces any previous token row for this user.
+        token = self.token_manager.generate_token(user_id)
         self.db.execute(
-            "INSERT INTO tokens (user_id, token, created_at) VALUES (?, ?, ?)",
-            (user_id, token, created_at),
+            _SQL_UPSERT_TOKEN,
+            (user_id, token, _iso_now()),
             commit=True,
         )
+        self._forget_user_tokens(user_id)
         return token
 
     def validate_token(self, token: str) -> dict:
-        token_row = self.db.execute(
-            """
-            SELECT users.id, users.username, users.email, users.role, users.created_at,
-                   tokens.token, tokens.created_at AS token_created_at
-            FROM tokens
-            INNER JOIN users ON users.id = tokens.user_id
-            WHERE tokens.token = ?
-            """,
-            (token,),
-            fetchone=True,
-        )
-        if not token_row:
+        claims = self.token_manager.read_token(token)
+        if claims is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token.",
             )
 
-        if self.token_manager.is_token_expired(token_row["token_created_at"]):
-            self.db.execute("DELETE FROM tokens WHERE token = ?", (token,), commit=True)
+        _user_id, issued_at = claims
+        if self.token_manager.is_token_expired(issued_at):
+            # The row itself is removed by purge_expired_tokens.
+            self._token_cache.pop(token)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token expired. Please log in again.",
             )
 
-        return {
+        cached_user = self._token_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+
+        # The tokens table still acts as the allow-list, so logout and
+        # re-login revoke older tokens.
+        token_row = self.db.execute(
+            _SQL_VALIDATE_TOKEN,
+            (token, self._expiry_cutoff()),
+            fetchone=True,
+        )
+        if not token_row:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token.",
+            )
+
+        user = {
             "id": token_row["id"],
             "username": token_row["username"],
             "email": token_row["email"],
             "role": token_row["role"],
             "created_at": token_row["created_at"],
         }
+        cache_ttl = min(
+            self.token_manager.seconds_until_expiry(issued_at),
+            TOKEN_CACHE_TTL_SECONDS,
+        )
+        with self._user_tokens_lock:
+            self._user_tokens.setdefault(user["id"], set()).add(token)
+        self._token_cache.set(token, user, ttl=cache_ttl)
+        return user
 
     def logout(self, token: str) -> None:
-        self.db.execute("DELETE FROM tokens WHERE token = ?", (token,), commit=True)
+        self.db.execute(_SQL_DELETE_TOKEN, (token,), commit=True)
+        user = self._token_cache.pop(token)
+        if user is not None:
+            with self._user_tokens_lock:
+                self._user_tokens.get(user["id"], set()).discard(token)
+
+    def _forget_user_tokens(self, user_id: int) -> None:
+        with self._user_tokens_lock:
+            tokens = self._user_tokens.pop(user_id, ())
+        for token in tokens:
+            self._token_cache.pop(token)
+
+    def purge_expired_tokens(self) -> None:
+        self.db.execute(_SQL_PURGE_EXPIRED_TOKENS, (self._expiry_cutoff(),), commit=True)
+
+    def _expiry_cutoff(self) -> str:
+        return _format_utc(int(time.time() - self.token_manager.ttl.total_seconds()))
 
 
 def parse_bearer_token(authorization: Optional[str]) -> str:
@@ -152,23 +364,23 @@ def parse_bearer_token(authorization: Optional[str]) -> str:
             detail="Authorization header missing.",
         )
 
-    parts = authorization.strip().split(" ")
-    if len(parts) != 2 or parts[0].lower() != "bearer" or not parts[1]:
+    token = authorization[7:].strip() if authorization[:7].lower() == "bearer " else ""
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authorization must be in format: Bearer <token>.",
         )
-    return parts[1]
+    return token
 
 
-_token_manager = TokenManager(ttl_hours=24)
 _auth_service: Optional[AuthService] = None
 
 
 def get_auth_service() -> AuthService:
     global _auth_service
     if _auth_service is None:
-        _auth_service = AuthService(get_database_manager(), _token_manager)
+        token_manager = TokenManager(load_token_secret(), ttl_hours=24)
+        _auth_service = AuthService(get_database_manager(), token_manager)
     return _auth_service
 
 
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe in-memory LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Drop every entry for which ``predicate(key, value)`` is true."""
+        with self._lock:
+            stale = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+AGGREGATE_CACHE_TTL_SECONDS = 30
+
+# Shared by the services and keyed by (user_id, aggregate name, *args),
+# so one write drops all of that user's entries together.
+_aggregate_cache = TTLCache(maxsize=2048, ttl=AGGREGATE_CACHE_TTL_SECONDS)
+# user_id -> count of forget_aggregates calls. A result is stored only if no write
+# happened while it was computed, so a read that began before a write cannot
+# put its stale value back after that write's invalidation.
+_aggregate_generations: dict[int, int] = {}
+_aggregate_generations_lock = threading.Lock()
+
+
+def cached_aggregate(key: tuple, compute: Callable[[], Any]) -> Any:
+    """Return the cached aggregate for ``key``, running ``compute`` and storing its result on a miss."""
+    value = _aggregate_cache.get(key)
+    if value is None:
+        user_id = key[0]
+        generation = _aggregate_generations.get(user_id, 0)
+        value = compute()
+        with _aggregate_generations_lock:
+            if _aggregate_generations.get(user_id, 0) == generation:
+                _aggregate_cache.set(key, value)
+    return value
+
+
+def forget_aggregates(user_id: int) -> None:
+    """Drop every cached aggregate of ``user_id``; called after each write."""
+    with _aggregate_generations_lock:
+        _aggregate_generations[user_id] = _aggregate_generations.get(user_id, 0) + 1
+    _aggregate_cache.discard_where(lambda key, _: key[0] == user_id)
@@ -1,24 +1,184 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
 import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Iterator, Optional
 
+# Applied to every new connection; journal_mode=WAL is set once in init_db
+# because it persists in the database file.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA mmap_size = 268435456;",
+    "PRAGMA cache_size = -65536;",
+)
 
-class DatabaseManager:
-    """Simple sqlite3 database manager with thread-safe execution."""
 
-    def __init__(self, db_path: str = "fitness.db") -> None:
-        self.db_path = str(Path(db_path))
+def _unicode_lower(value: Optional[str]) -> Optional[str]:
+    """Python's Unicode-aware lower(); SQLite's built-in lower() only folds ASCII."""
+    return value.lower() if isinstance(value, str) else value
+
+
+# (cursor.description, its column names) for the most recent result set. sqlite3
+# hands out the same description tuple for every row of one statement, so the
+# names are extracted once per query instead of once per row. Holding the tuple
+# keeps its id from being reused; another thread replacing it only costs a rebuild.
+_last_columns: tuple[Optional[tuple], tuple[str, ...]] = (None, ())
+
+
+def _dict_row_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
+    """Build result rows as plain dicts straight from the cursor."""
+    global _last_columns
+    description = cursor.description
+    cached = _last_columns
+    if cached[0] is not description:
+        cached = _last_columns = (description, tuple(column[0] for column in description))
+    return dict(zip(cached[1], row))
+
+
+def filter_params(user_id: int, *values: Optional[str]) -> tuple[tuple[bool, ...], list[object]]:
+    """Map optional filter values to a prebuilt-statement key and the parameters it binds."""
+    params: list[object] = [user_id]
+    params.extend(value for value in values if value)
+    return tuple(bool(value) for value in values), params
+
+
+class SQLiteConnectionPool:
+    """Bounded pool of persistent sqlite3 connections shared across threads."""
+
+    def __init__(
+        self,
+        db_path: str,
+        min_size: int = 2,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        pre_ping: bool = False,
+    ) -> None:
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
         self._lock = threading.Lock()
+        # Signalled whenever a connection is returned or a slot is freed.
+        self._cond = threading.Condition(self._lock)
+        self._total = 0
+        for _ in range(min_size):
+            self._total += 1
+            self._idle.put(self._connect())
 
-    def _get_connection(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(self.db_path, check_same_thread=False)
-        connection.row_factory = sqlite3.Row
-        connection.execute("PRAGMA foreign_keys = ON;")
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 keeps compiled statements keyed by SQL text; raise the
+        # default of 128 so every fixed query in the app stays prepared.
+        connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        connection.row_factory = _dict_row_factory
+        connection.create_function("py_lower", 1, _unicode_lower, deterministic=True)
+        for pragma in CONNECTION_PRAGMAS:
+            connection.execute(pragma)
         return connection
 
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        connection = self._checkout()
+        try:
+            yield connection
+        finally:
+            self._release(connection)
+
+    def _release(self, connection: sqlite3.Connection) -> None:
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            # A connection that cannot roll back is not safe to reuse; free its slot instead.
+            self._discard(connection)
+            return
+        self._idle.put(connection)
+        with self._cond:
+            self._cond.notify()
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._open_or_wait()
+
+        if self.pre_ping:
+            try:
+                connection.execute("SELECT 1")
+            except sqlite3.Error:
+                self._discard(connection)
+                return self._checkout()
+        return connection
+
+    def _open_or_wait(self) -> sqlite3.Connection:
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                try:
+                    return self._idle.get_nowait()
+                except queue.Empty:
+                    pass
+                if self._total < self.max_size:
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError("Timed out waiting for a database connection.")
+                self._cond.wait(remaining)
+
+        try:
+            return self._connect()
+        except sqlite3.Error:
+            self._free_slot()
+            raise
+
+    def _discard(self, connection: sqlite3.Connection) -> None:
+        try:
+            connection.close()
+        finally:
+            self._free_slot()
+
+    def _free_slot(self) -> None:
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            total = self._total
+        idle = self._idle.qsize()
+        return {"active": total - idle, "idle": idle, "total": total, "max_size": self.max_size}
+
+    def close_all(self) -> None:
+        """Close idle connections; connections in use are returned and reused later."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+
+class DatabaseManager:
+    """Simple sqlite3 database manager backed by a connection pool."""
+
+    def __init__(self, db_path: str = "fitness.db") -> None:
+        self.db_path = str(Path(db_path))
+        self.pool = SQLiteConnectionPool(self.db_path)
+        # Readers run concurrently under WAL; only writers are serialized.
+        self._write_lock = threading.Lock()
+        self._initialized = False
+
     def execute(
         self,
         query: str,
@@ -28,18 +188,46 @@ class DatabaseManager:
         fetchall: bool = False,
         commit: bool = False,
     ) -> Optional[Any]:
-        with self._lock:
-            with self._get_connection() as connection:
-                cursor = connection.execute(query, tuple(params))
-                if commit:
-                    connection.commit()
-                if fetchone:
-                    row = cursor.fetchone()
-                    return dict(row) if row else None
-                if fetchall:
-                    rows = cursor.fetchall()
-                    return [dict(row) for row in rows]
-                return None
+        if commit:
+            with self._write_lock:
+                return self._execute(query, params, fetchone=fetchone, fetchall=fetchall, commit=True)
+        return self._execute(query, params, fetchone=fetchone, fetchall=fetchall, commit=False)
+
+    def execute_write(self, query: str, params: Iterable[Any] = ()) -> int:
+        """Run and commit one write statement, returning the number of affected rows."""
+        with self._write_lock, self.pool.acquire() as connection:
+            cursor = connection.execute(query, tuple(params))
+            connection.commit()
+            return cursor.rowcount
+
+    def execute_many(self, query: str, seq_of_params: Iterable[Iterable[Any]]) -> int:
+        """Run one statement for every parameter set in a single transaction."""
+        with self._write_lock, self.pool.acquire() as connection:
+            cursor = connection.executemany(query, (tuple(params) for params in seq_of_params))
+            connection.commit()
+            return cursor.rowcount
+
+    def _execute(
+        self,
+        query: str,
+        params: Iterable[Any],
+        *,
+        fetchone: bool,
+        fetchall: bool,
+        commit: bool,
+    ) -> Optional[Any]:
+        with self.pool.acquire() as connection:
+            cursor = connection.execute(query, tuple(params))
+            # Fetch before committing so INSERT/UPDATE ... RETURNING rows are
+            # fully stepped inside the write transaction.
+            result = None
+            if fetchone:
+                result = cursor.fetchone()
+            elif fetchall:
+                result = cursor.fetchall()
+            if commit:
+                connection.commit()
+            return result
 
     def init_db(self) -> None:
         schema_statements = [
@@ -97,17 +285,33 @@ class DatabaseManager:
             );
             """,
             "CREATE INDEX IF NOT EXISTS idx_tokens_token ON tokens(token);",
+            # One token row per user; older databases may still hold duplicates.
+            "DELETE FROM tokens WHERE id NOT IN (SELECT MAX(id) FROM tokens GROUP BY user_id);",
+            "DROP INDEX IF EXISTS idx_tokens_user;",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_tokens_user_unique ON tokens(user_id);",
+            # Each entry also carries its rowid, so these indexes serve both the date
+            # range and "ORDER BY date, id" in either direction without a sort step.
             "CREATE INDEX IF NOT EXISTS idx_workouts_user_date ON workouts(user_id, date);",
             "CREATE INDEX IF NOT EXISTS idx_nutrition_user_date ON nutrition(user_id, date);",
             "CREATE INDEX IF NOT EXISTS idx_weights_user_date ON weights(user_id, date);",
         ]
+        # Indexes on columns that _run_migrations may have just added.
+        post_migration_statements = [
+            "CREATE INDEX IF NOT EXISTS idx_workouts_user_week ON workouts(user_id, week);",
+        ]
 
-        with self._lock:
-            with self._get_connection() as connection:
-                for statement in schema_statements:
-                    connection.execute(statement)
-                self._run_migrations(connection)
-                connection.commit()
+        with self._write_lock, self.pool.acquire() as connection:
+            if self._initialized:
+                return
+            # WAL is stored in the database file, so later connections inherit it.
+            connection.execute("PRAGMA journal_mode = WAL;")
+            for statement in schema_statements:
+                connection.execute(statement)
+            self._run_migrations(connection)
+            for statement in post_migration_statements:
+                connection.execute(statement)
+            connection.commit()
+            self._initialized = True
 
     def _run_migrations(self, connection: sqlite3.Connection) -> None:
         """Apply lightweight schema migrations for existing databases."""
@@ -130,6 +334,8 @@ class DatabaseManager:
                 "duration_minutes": "INTEGER NOT NULL DEFAULT 0",
                 "calories_burned": "INTEGER NOT NULL DEFAULT 0",
                 "date": "TEXT NOT NULL DEFAULT ''",
+                # ALTER TABLE can only add VIRTUAL generated columns; the index stores the value.
+                "week": "TEXT GENERATED ALWAYS AS (strftime('%Y-W%W', date)) VIRTUAL",
             },
             "nutrition": {
                 "user_id": "INTEGER NOT NULL DEFAULT 0",
@@ -149,27 +355,14 @@ class DatabaseManager:
         }
 
         for table_name, columns in migrations.items():
+            # table_xinfo also lists generated columns, which table_info hides.
+            rows = connection.execute(f"PRAGMA table_xinfo({table_name})").fetchall()
+            existing_columns = {row["name"] for row in rows}
             for column_name, column_sql in columns.items():
-                self._ensure_column(
-                    connection,
-                    table_name=table_name,
-                    column_name=column_name,
-                    column_sql=column_sql,
-                )
-
-    @staticmethod
-    def _ensure_column(
-        connection: sqlite3.Connection,
-        table_name: str,
-        column_name: str,
-        column_sql: str,
-    ) -> None:
-        rows = connection.execute(f"PRAGMA table_info({table_name})").fetchall()
-        existing_columns = {row[1] for row in rows}
-        if column_name not in existing_columns:
-            connection.execute(
-                f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_sql}"
-            )
+                if column_name not in existing_columns:
+                    connection.execute(
+                        f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_sql}"
+                    )
 
 
 _db_manager: Optional[DatabaseManager] = None
@@ -1,19 +1,58 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+import logging
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from auth import get_auth_service
 from database import get_database_manager
 from routers import nutrition_router, user_router, workout_router
 
+TOKEN_PURGE_INTERVAL_SECONDS = 300
+
+# The health payload never changes, so encode it once at import time.
+_HEALTH_BODY = orjson.dumps({"status": "ok", "message": "Fitness API is running."})
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_expired_tokens_periodically() -> None:
+    auth_service = get_auth_service()
+    while True:
+        try:
+            await asyncio.to_thread(auth_service.purge_expired_tokens)
+        except sqlite3.Error:
+            logger.exception("Expired token purge failed.")
+        await asyncio.sleep(TOKEN_PURGE_INTERVAL_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    purge_task = asyncio.create_task(purge_expired_tokens_periodically())
+    try:
+        yield
+    finally:
+        purge_task.cancel()
+        get_database_manager().pool.close_all()
+
+
 app = FastAPI(
     title="Fitness Web App API",
     version="1.0.0",
     description="FastAPI backend for workouts, nutrition, and user progress tracking.",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Initialize database and tables at startup.
-get_database_manager().init_db()
+# Initialize database and tables at startup (init_db runs once per manager).
+get_database_manager()
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,5 +68,10 @@ app.include_router(nutrition_router.router)
 
 
 @app.get("/", tags=["Health"])
-def health_check() -> dict:
-    return {"status": "ok", "message": "Fitness API is running."}
+async def health_check() -> Response:
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+
+@app.get("/pool-health", tags=["Health"])
+def pool_health() -> dict:
+    return get_database_manager().pool.stats()
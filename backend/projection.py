@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+
+def select_columns(fields: Optional[str], allowed: Sequence[str]) -> str:
+    """Turn a comma-separated ``?fields=`` value into a SELECT list drawn only from ``allowed``."""
+    requested = {field.strip() for field in fields.split(",") if field.strip()} if fields else set()
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))}.",
+        )
+    # Keep the table's column order so each distinct projection maps to one cached statement.
+    return ", ".join(field for field in allowed if not requested or field in requested)
+
+
+def projected_list_responses(model: type[BaseModel]) -> dict[int | str, dict[str, Any]]:
+    """OpenAPI ``responses`` for a list route whose items may be narrowed with ``?fields=``."""
+    return {
+        200: {
+            "model": list[model],
+            "description": "Every field of each row, or only the fields named in `fields` when it is given.",
+        }
+    }
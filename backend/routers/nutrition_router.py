@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
 
 from auth import get_current_user
 from database import get_database_manager
-from schemas import MessageResponse, NutritionCreate, NutritionResponse, NutritionUpdate
+from projection import projected_list_responses
+from schemas import (
+    BulkInsertResponse,
+    CountResponse,
+    DailyTotalResponse,
+    MessageResponse,
+    NutritionCreate,
+    NutritionResponse,
+    NutritionUpdate,
+)
 from services.nutrition_service import NutritionService
 
 router = APIRouter(tags=["Nutrition"])
@@ -16,15 +27,46 @@ def get_nutrition_service() -> NutritionService:
     return NutritionService(get_database_manager())
 
 
-@router.get("/meals", response_model=list[NutritionResponse], status_code=status.HTTP_200_OK)
-def get_meals(
+# Items may be partial, so the schema is documented here instead of validated via response_model.
+@router.get(
+    "/meals",
+    response_model=None,
+    responses=projected_list_responses(NutritionResponse),
+    status_code=status.HTTP_200_OK,
+)
+async def get_meals(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of response fields to return."),
     current_user: dict = Depends(get_current_user),
     nutrition_service: NutritionService = Depends(get_nutrition_service),
-) -> list[NutritionResponse]:
-    rows = nutrition_service.list_meals(current_user["id"], start_date, end_date)
-    return [NutritionResponse(**row) for row in rows]
+) -> ORJSONResponse:
+    rows = await asyncio.to_thread(
+        nutrition_service.list_meals, current_user["id"], start_date, end_date, search, limit, offset, fields
+    )
+    # The rows already match NutritionResponse; serialize them directly instead of re-validating.
+    return ORJSONResponse(rows)
+
+
+@router.get("/meals/count", response_model=CountResponse, status_code=status.HTTP_200_OK)
+async def count_meals(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    nutrition_service: NutritionService = Depends(get_nutrition_service),
+) -> CountResponse:
+    count = await asyncio.to_thread(
+        nutrition_service.count_meals,
+        current_user["id"],
+        start_date,
+        end_date,
+        search,
+    )
+    return CountResponse(count=count)
 
 
 @router.post("/meals", response_model=NutritionResponse, status_code=status.HTTP_201_CREATED)
@@ -32,18 +74,51 @@ def create_meal(
     payload: NutritionCreate,
     current_user: dict = Depends(get_current_user),
     nutrition_service: NutritionService = Depends(get_nutrition_service),
-) -> NutritionResponse:
-    row = nutrition_service.add_meal(current_user["id"], payload)
-    return NutritionResponse(**row)
+) -> dict:
+    return nutrition_service.add_meal(current_user["id"], payload)
+
+
+@router.post("/meals/bulk", response_model=BulkInsertResponse, status_code=status.HTTP_201_CREATED)
+def create_meals_bulk(
+    payload: list[NutritionCreate],
+    current_user: dict = Depends(get_current_user),
+    nutrition_service: NutritionService = Depends(get_nutrition_service),
+) -> BulkInsertResponse:
+    return BulkInsertResponse(inserted=nutrition_service.add_meals_bulk(current_user["id"], payload))
 
 
 @router.get("/meals/macros", status_code=status.HTTP_200_OK)
-def get_daily_macros(
+async def get_daily_macros(
     date: str,
     current_user: dict = Depends(get_current_user),
     nutrition_service: NutritionService = Depends(get_nutrition_service),
 ) -> dict:
-    return nutrition_service.get_daily_macros(current_user["id"], date)
+    return await asyncio.to_thread(nutrition_service.get_daily_macros, current_user["id"], date)
+
+
+@router.get("/meals/daily-calories", response_model=list[DailyTotalResponse], status_code=status.HTTP_200_OK)
+async def daily_calories_consumed(
+    days: int = Query(90, ge=1, le=365),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    nutrition_service: NutritionService = Depends(get_nutrition_service),
+) -> list[dict]:
+    # Explicit filters (as used by the meal history page) take precedence over the days window.
+    if start_date or end_date or search:
+        return await asyncio.to_thread(
+            nutrition_service.get_calories_by_date,
+            current_user["id"],
+            start_date,
+            end_date,
+            search,
+        )
+    return await asyncio.to_thread(
+        nutrition_service.get_daily_calories_consumed,
+        current_user["id"],
+        days,
+    )
 
 
 @router.put("/meals/{meal_id}", response_model=NutritionResponse, status_code=status.HTTP_200_OK)
@@ -52,9 +127,8 @@ def update_meal(
     payload: NutritionUpdate,
     current_user: dict = Depends(get_current_user),
     nutrition_service: NutritionService = Depends(get_nutrition_service),
-) -> NutritionResponse:
-    row = nutrition_service.update_meal(current_user["id"], meal_id, payload)
-    return NutritionResponse(**row)
+) -> dict:
+    return nutrition_service.update_meal(current_user["id"], meal_id, payload)
 
 
 @router.delete("/meals/{meal_id}", response_model=MessageResponse, status_code=status.HTTP_200_OK)
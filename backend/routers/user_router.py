@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
 
 from auth import AuthService, get_auth_service, get_current_token, get_current_user
 from database import get_database_manager
+from projection import projected_list_responses
 from schemas import (
+    BulkInsertResponse,
+    DashboardFullResponse,
     DashboardResponse,
     MessageResponse,
     TokenResponse,
@@ -38,8 +43,8 @@ def register_user(
 def login_user(
     payload: UserLogin,
     auth_service: AuthService = Depends(get_auth_service),
-) -> TokenResponse:
-    return TokenResponse(**auth_service.authenticate_user(payload))
+) -> dict:
+    return auth_service.authenticate_user(payload)
 
 
 @router.post("/logout", response_model=MessageResponse, status_code=status.HTTP_200_OK)
@@ -53,22 +58,42 @@ def logout_user(
 
 
 @router.get("/dashboard", response_model=DashboardResponse, status_code=status.HTTP_200_OK)
-def get_dashboard(
+async def get_dashboard(
     current_user: dict = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
-) -> DashboardResponse:
-    return DashboardResponse(**user_service.get_dashboard_stats(current_user["id"]))
+) -> dict:
+    return await asyncio.to_thread(user_service.get_dashboard_stats, current_user["id"])
 
 
-@router.get("/weights", response_model=list[WeightResponse], status_code=status.HTTP_200_OK)
-def list_weights(
+@router.get("/dashboard/full", response_model=DashboardFullResponse, status_code=status.HTTP_200_OK)
+async def get_dashboard_full(
+    days: int = Query(30, ge=1, le=365),
+    current_user: dict = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service),
+) -> dict:
+    return await asyncio.to_thread(user_service.get_dashboard_full, current_user["id"], days)
+
+
+# Items may be partial, so the schema is documented here instead of validated via response_model.
+@router.get(
+    "/weights",
+    response_model=None,
+    responses=projected_list_responses(WeightResponse),
+    status_code=status.HTTP_200_OK,
+)
+async def list_weights(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of response fields to return."),
     current_user: dict = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
-) -> list[WeightResponse]:
-    rows = user_service.list_weight_entries(current_user["id"], start_date, end_date)
-    return [WeightResponse(**row) for row in rows]
+) -> ORJSONResponse:
+    rows = await asyncio.to_thread(
+        user_service.list_weight_entries, current_user["id"], start_date, end_date, limit, offset, fields
+    )
+    return ORJSONResponse(rows)
 
 
 @router.post("/weights", response_model=WeightResponse, status_code=status.HTTP_201_CREATED)
@@ -76,9 +101,17 @@ def create_weight(
     payload: WeightCreate,
     current_user: dict = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
-) -> WeightResponse:
-    row = user_service.add_weight_entry(current_user["id"], payload)
-    return WeightResponse(**row)
+) -> dict:
+    return user_service.add_weight_entry(current_user["id"], payload)
+
+
+@router.post("/weights/bulk", response_model=BulkInsertResponse, status_code=status.HTTP_201_CREATED)
+def create_weights_bulk(
+    payload: list[WeightCreate],
+    current_user: dict = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service),
+) -> BulkInsertResponse:
+    return BulkInsertResponse(inserted=user_service.add_weight_entries_bulk(current_user["id"], payload))
 
 
 @router.put("/weights/{weight_id}", response_model=WeightResponse, status_code=status.HTTP_200_OK)
@@ -87,9 +120,8 @@ def update_weight(
     payload: WeightUpdate,
     current_user: dict = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
-) -> WeightResponse:
-    row = user_service.update_weight_entry(current_user["id"], weight_id, payload)
-    return WeightResponse(**row)
+) -> dict:
+    return user_service.update_weight_entry(current_user["id"], weight_id, payload)
 
 
 @router.delete("/weights/{weight_id}", response_model=MessageResponse, status_code=status.HTTP_200_OK)
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
 
 from auth import get_current_user
 from database import get_database_manager
-from schemas import MessageResponse, WorkoutCreate, WorkoutResponse, WorkoutUpdate
+from projection import projected_list_responses
+from schemas import (
+    BulkInsertResponse,
+    CountResponse,
+    DailyTotalResponse,
+    MessageResponse,
+    WorkoutCreate,
+    WorkoutResponse,
+    WorkoutUpdate,
+)
 from services.workout_service import WorkoutService
 
 router = APIRouter(tags=["Workouts"])
@@ -16,15 +27,45 @@ def get_workout_service() -> WorkoutService:
     return WorkoutService(get_database_manager())
 
 
-@router.get("/workouts", response_model=list[WorkoutResponse], status_code=status.HTTP_200_OK)
-def get_workouts(
+# Items may be partial, so the schema is documented here instead of validated via response_model.
+@router.get(
+    "/workouts",
+    response_model=None,
+    responses=projected_list_responses(WorkoutResponse),
+    status_code=status.HTTP_200_OK,
+)
+async def get_workouts(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of response fields to return."),
     current_user: dict = Depends(get_current_user),
     workout_service: WorkoutService = Depends(get_workout_service),
-) -> list[WorkoutResponse]:
-    rows = workout_service.list_workouts(current_user["id"], start_date, end_date)
-    return [WorkoutResponse(**row) for row in rows]
+) -> ORJSONResponse:
+    rows = await asyncio.to_thread(
+        workout_service.list_workouts, current_user["id"], start_date, end_date, search, limit, offset, fields
+    )
+    return ORJSONResponse(rows)
+
+
+@router.get("/workouts/count", response_model=CountResponse, status_code=status.HTTP_200_OK)
+async def count_workouts(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    workout_service: WorkoutService = Depends(get_workout_service),
+) -> CountResponse:
+    count = await asyncio.to_thread(
+        workout_service.count_workouts,
+        current_user["id"],
+        start_date,
+        end_date,
+        search,
+    )
+    return CountResponse(count=count)
 
 
 @router.post("/workouts", response_model=WorkoutResponse, status_code=status.HTTP_201_CREATED)
@@ -32,25 +73,61 @@ def create_workout(
     payload: WorkoutCreate,
     current_user: dict = Depends(get_current_user),
     workout_service: WorkoutService = Depends(get_workout_service),
-) -> WorkoutResponse:
-    row = workout_service.add_workout(current_user["id"], payload)
-    return WorkoutResponse(**row)
+) -> dict:
+    return workout_service.add_workout(current_user["id"], payload)
+
+
+@router.post("/workouts/bulk", response_model=BulkInsertResponse, status_code=status.HTTP_201_CREATED)
+def create_workouts_bulk(
+    payload: list[WorkoutCreate],
+    current_user: dict = Depends(get_current_user),
+    workout_service: WorkoutService = Depends(get_workout_service),
+) -> BulkInsertResponse:
+    return BulkInsertResponse(inserted=workout_service.add_workouts_bulk(current_user["id"], payload))
 
 
 @router.get("/workouts/weekly-calories", status_code=status.HTTP_200_OK)
-def weekly_calories(
+async def weekly_calories(
     current_user: dict = Depends(get_current_user),
     workout_service: WorkoutService = Depends(get_workout_service),
 ) -> dict:
-    return {"weekly_calories_burned": workout_service.get_weekly_calories_burned(current_user["id"])}
+    weekly_total = await asyncio.to_thread(workout_service.get_weekly_calories_burned, current_user["id"])
+    return {"weekly_calories_burned": weekly_total}
 
 
 @router.get("/workouts/frequency", status_code=status.HTTP_200_OK)
-def workout_frequency(
+async def workout_frequency(
     current_user: dict = Depends(get_current_user),
     workout_service: WorkoutService = Depends(get_workout_service),
 ) -> list[dict]:
-    return workout_service.get_workout_frequency_by_week(current_user["id"])
+    return await asyncio.to_thread(
+        workout_service.get_workout_frequency_by_week,
+        current_user["id"],
+    )
+
+
+@router.get("/workouts/daily-calories", response_model=list[DailyTotalResponse], status_code=status.HTTP_200_OK)
+async def daily_calories_burned(
+    days: int = Query(90, ge=1, le=365),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    workout_service: WorkoutService = Depends(get_workout_service),
+) -> list[dict]:
+    if start_date or end_date or search:
+        return await asyncio.to_thread(
+            workout_service.get_calories_burned_by_date,
+            current_user["id"],
+            start_date,
+            end_date,
+            search,
+        )
+    return await asyncio.to_thread(
+        workout_service.get_daily_calories_burned,
+        current_user["id"],
+        days,
+    )
 
 
 @router.put("/workouts/{workout_id}", response_model=WorkoutResponse, status_code=status.HTTP_200_OK)
@@ -59,9 +136,8 @@ def update_workout(
     payload: WorkoutUpdate,
     current_user: dict = Depends(get_current_user),
     workout_service: WorkoutService = Depends(get_workout_service),
-) -> WorkoutResponse:
-    row = workout_service.update_workout(current_user["id"], workout_id, payload)
-    return WorkoutResponse(**row)
+) -> dict:
+    return workout_service.update_workout(current_user["id"], workout_id, payload)
 
 
 @router.delete("/workouts/{workout_id}", response_model=MessageResponse, status_code=status.HTTP_200_OK)
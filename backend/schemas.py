@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import re
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+_USERNAME_MATCH = re.compile(r"^[A-Za-z0-9_]+$").match
+_EMAIL_MATCH = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$").match
 
 
 class UserCreate(BaseModel):
@@ -11,18 +15,30 @@ class UserCreate(BaseModel):
         ...,
         min_length=3,
         max_length=30,
-        pattern=r"^[A-Za-z0-9_]+$",
         description="Unique username with letters, numbers, and underscores.",
     )
     email: str = Field(
         ...,
         min_length=5,
         max_length=254,
-        pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$",
         description="Valid email address.",
     )
     password: str = Field(..., min_length=6, max_length=128)
 
+    @field_validator("username")
+    @classmethod
+    def validate_username(cls, value: str) -> str:
+        if not _USERNAME_MATCH(value):
+            raise ValueError("Username may only contain letters, numbers, and underscores.")
+        return value
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, value: str) -> str:
+        if "@" not in value or not _EMAIL_MATCH(value):
+            raise ValueError("Invalid email address.")
+        return value
+
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -70,6 +86,14 @@ class MessageResponse(BaseModel):
     message: str
 
 
+class BulkInsertResponse(BaseModel):
+    inserted: int
+
+
+class CountResponse(BaseModel):
+    count: int
+
+
 class WorkoutCreate(BaseModel):
     workout_name: str = Field(..., min_length=1, max_length=100)
     duration_minutes: int = Field(..., gt=0, le=600)
@@ -202,3 +226,14 @@ class DashboardResponse(BaseModel):
     total_workouts: int
     total_calories_burned: int
     total_calories_consumed: int
+
+
+class DailyTotalResponse(BaseModel):
+    date: date
+    total: int
+
+
+class DashboardFullResponse(BaseModel):
+    stats: DashboardResponse
+    daily_calories_burned: list[DailyTotalResponse]
+    daily_calories_consumed: list[DailyTotalResponse]
@@ -4,9 +4,83 @@ from typing import Optional
 
 from fastapi import HTTPException, status
 
-from database import DatabaseManager
+from cache import cached_aggregate, forget_aggregates
+from database import DatabaseManager, filter_params
+from projection import select_columns
 from schemas import NutritionCreate, NutritionUpdate
 
+_MEAL_FIELDS = ("id", "user_id", "meal_name", "calories", "protein", "carbs", "fats", "date")
+_MEAL_COLUMNS = ", ".join(_MEAL_FIELDS)
+
+# One fixed WHERE clause per (has start_date, has end_date, has search) combination.
+_MEAL_FILTERS = {
+    (has_start, has_end, has_search): "user_id = ?"
+    + (" AND date >= ?" if has_start else "")
+    + (" AND date <= ?" if has_end else "")
+    + (" AND instr(py_lower(meal_name), py_lower(?)) > 0" if has_search else "")
+    for has_start in (False, True)
+    for has_end in (False, True)
+    for has_search in (False, True)
+}
+# A LIMIT of -1 means "no limit" in SQLite, so one statement serves paged and full reads.
+# {columns} is filled with the validated ?fields= projection.
+_SQL_LIST_MEALS = {
+    key: f"""
+        SELECT {{columns}}
+        FROM nutrition
+        WHERE {where}
+        ORDER BY date DESC, id DESC
+        LIMIT ? OFFSET ?
+    """
+    for key, where in _MEAL_FILTERS.items()
+}
+_SQL_COUNT_MEALS = {
+    key: f"SELECT COUNT(*) AS count FROM nutrition WHERE {where}" for key, where in _MEAL_FILTERS.items()
+}
+_SQL_CALORIES_BY_DATE = {
+    key: f"""
+        SELECT date, SUM(calories) AS total
+        FROM nutrition
+        WHERE {where}
+        GROUP BY date
+        ORDER BY date ASC
+    """
+    for key, where in _MEAL_FILTERS.items()
+}
+_SQL_INSERT_MEAL_ROW = """
+    INSERT INTO nutrition (user_id, meal_name, calories, protein, carbs, fats, date)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_MEAL = f"{_SQL_INSERT_MEAL_ROW} RETURNING {_MEAL_COLUMNS}"
+_SQL_UPDATE_MEAL = f"""
+    UPDATE nutrition
+    SET meal_name = COALESCE(?, meal_name),
+        calories = COALESCE(?, calories),
+        protein = COALESCE(?, protein),
+        carbs = COALESCE(?, carbs),
+        fats = COALESCE(?, fats),
+        date = COALESCE(?, date)
+    WHERE id = ? AND user_id = ?
+    RETURNING {_MEAL_COLUMNS}
+"""
+_SQL_DELETE_MEAL = "DELETE FROM nutrition WHERE id = ? AND user_id = ?"
+_SQL_DAILY_MACROS = """
+    SELECT
+        COALESCE(SUM(protein), 0) AS total_protein,
+        COALESCE(SUM(carbs), 0) AS total_carbs,
+        COALESCE(SUM(fats), 0) AS total_fats,
+        COALESCE(SUM(calories), 0) AS total_calories
+    FROM nutrition
+    WHERE user_id = ? AND date = ?
+"""
+_SQL_DAILY_CALORIES_CONSUMED = """
+    SELECT date, SUM(calories) AS total
+    FROM nutrition
+    WHERE user_id = ? AND date >= date('now', ?)
+    GROUP BY date
+    ORDER BY date ASC
+"""
+
 
 class NutritionService:
     """Meal CRUD and macro calculations."""
@@ -19,31 +93,30 @@ class NutritionService:
         user_id: int,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[str] = None,
     ) -> list[dict]:
-        conditions = ["user_id = ?"]
-        params: list[object] = [user_id]
-
-        if start_date:
-            conditions.append("date >= ?")
-            params.append(start_date)
-        if end_date:
-            conditions.append("date <= ?")
-            params.append(end_date)
-
-        query = f"""
-            SELECT id, user_id, meal_name, calories, protein, carbs, fats, date
-            FROM nutrition
-            WHERE {' AND '.join(conditions)}
-            ORDER BY date DESC, id DESC
-        """
-        return self.db.execute(query, params, fetchall=True) or []
+        """Return the user's meals, newest first, matching the filters."""
+        columns = select_columns(fields, _MEAL_FIELDS)
+        key, params = filter_params(user_id, start_date, end_date, search)
+        params.extend([-1 if limit is None else limit, offset])
+        return self.db.execute(_SQL_LIST_MEALS[key].format(columns=columns), params, fetchall=True)
+
+    def count_meals(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        key, params = filter_params(user_id, start_date, end_date, search)
+        return int(self.db.execute(_SQL_COUNT_MEALS[key], params, fetchone=True)["count"])
 
     def add_meal(self, user_id: int, meal: NutritionCreate) -> dict:
-        self.db.execute(
-            """
-            INSERT INTO nutrition (user_id, meal_name, calories, protein, carbs, fats, date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+        created = self.db.execute(
+            _SQL_INSERT_MEAL,
             (
                 user_id,
                 meal.meal_name,
@@ -53,97 +126,94 @@ class NutritionService:
                 meal.fats,
                 meal.date.isoformat(),
             ),
+            fetchone=True,
             commit=True,
         )
+        forget_aggregates(user_id)
+        return created
 
-        return self.db.execute(
-            """
-            SELECT id, user_id, meal_name, calories, protein, carbs, fats, date
-            FROM nutrition
-            WHERE user_id = ?
-            ORDER BY id DESC
-            LIMIT 1
-            """,
-            (user_id,),
-            fetchone=True,
+    def add_meals_bulk(self, user_id: int, meals: list[NutritionCreate]) -> int:
+        inserted = self.db.execute_many(
+            _SQL_INSERT_MEAL_ROW,
+            (
+                (
+                    user_id,
+                    meal.meal_name,
+                    meal.calories,
+                    meal.protein,
+                    meal.carbs,
+                    meal.fats,
+                    meal.date.isoformat(),
+                )
+                for meal in meals
+            ),
         )
+        forget_aggregates(user_id)
+        return inserted
 
     def update_meal(self, user_id: int, meal_id: int, meal: NutritionUpdate) -> dict:
-        existing = self.db.execute(
-            """
-            SELECT id, user_id, meal_name, calories, protein, carbs, fats, date
-            FROM nutrition
-            WHERE id = ? AND user_id = ?
-            """,
-            (meal_id, user_id),
+        # COALESCE keeps the stored value for every field left out of the payload.
+        updated = self.db.execute(
+            _SQL_UPDATE_MEAL,
+            (
+                meal.meal_name,
+                meal.calories,
+                meal.protein,
+                meal.carbs,
+                meal.fats,
+                meal.date.isoformat() if meal.date else None,
+                meal_id,
+                user_id,
+            ),
             fetchone=True,
+            commit=True,
         )
-        if not existing:
+        if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Meal not found.",
             )
-
-        update_fields = meal.model_dump(exclude_none=True)
-        if not update_fields:
-            return existing
-
-        set_clauses = []
-        values: list[object] = []
-        for key, value in update_fields.items():
-            set_clauses.append(f"{key} = ?")
-            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
-
-        values.extend([meal_id, user_id])
-        query = f"UPDATE nutrition SET {', '.join(set_clauses)} WHERE id = ? AND user_id = ?"
-        self.db.execute(query, values, commit=True)
-
-        return self.db.execute(
-            """
-            SELECT id, user_id, meal_name, calories, protein, carbs, fats, date
-            FROM nutrition
-            WHERE id = ? AND user_id = ?
-            """,
-            (meal_id, user_id),
-            fetchone=True,
-        )
+        forget_aggregates(user_id)
+        return updated
 
     def delete_meal(self, user_id: int, meal_id: int) -> None:
-        existing = self.db.execute(
-            "SELECT id FROM nutrition WHERE id = ? AND user_id = ?",
-            (meal_id, user_id),
-            fetchone=True,
-        )
-        if not existing:
+        deleted = self.db.execute_write(_SQL_DELETE_MEAL, (meal_id, user_id))
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Meal not found.",
             )
+        forget_aggregates(user_id)
 
-        self.db.execute(
-            "DELETE FROM nutrition WHERE id = ? AND user_id = ?",
-            (meal_id, user_id),
-            commit=True,
+    def get_daily_macros(self, user_id: int, target_date: str) -> dict:
+        def compute() -> dict:
+            macros = self.db.execute(_SQL_DAILY_MACROS, (user_id, target_date), fetchone=True)
+            return {
+                "date": target_date,
+                "total_protein": float(macros["total_protein"]),
+                "total_carbs": float(macros["total_carbs"]),
+                "total_fats": float(macros["total_fats"]),
+                "total_calories": int(macros["total_calories"]),
+            }
+
+        return cached_aggregate((user_id, "daily_macros", target_date), compute)
+
+    def get_daily_calories_consumed(self, user_id: int, days: int = 90) -> list[dict]:
+        return cached_aggregate(
+            (user_id, "daily_calories_consumed", days),
+            lambda: self.db.execute(_SQL_DAILY_CALORIES_CONSUMED, (user_id, f"-{days} days"), fetchall=True)
+            or [],
         )
 
-    def get_daily_macros(self, user_id: int, target_date: str) -> dict:
-        macros = self.db.execute(
-            """
-            SELECT
-                COALESCE(SUM(protein), 0) AS total_protein,
-                COALESCE(SUM(carbs), 0) AS total_carbs,
-                COALESCE(SUM(fats), 0) AS total_fats,
-                COALESCE(SUM(calories), 0) AS total_calories
-            FROM nutrition
-            WHERE user_id = ? AND date = ?
-            """,
-            (user_id, target_date),
-            fetchone=True,
+    def get_calories_by_date(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> list[dict]:
+        key, params = filter_params(user_id, start_date, end_date, search)
+        return cached_aggregate(
+            (user_id, "calories_consumed_by_date", start_date, end_date, search),
+            lambda: self.db.execute(_SQL_CALORIES_BY_DATE[key], params, fetchall=True) or [],
         )
-        return {
-            "date": target_date,
-            "total_protein": float(macros["total_protein"]),
-            "total_carbs": float(macros["total_carbs"]),
-            "total_fats": float(macros["total_fats"]),
-            "total_calories": int(macros["total_calories"]),
-        }
@@ -1,12 +1,61 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Optional
 
 from fastapi import HTTPException, status
 
-from database import DatabaseManager
+from database import DatabaseManager, filter_params
+from projection import select_columns
 from schemas import WeightCreate, WeightUpdate
+from services.nutrition_service import NutritionService
+from services.workout_service import WorkoutService
+
+_WEIGHT_FIELDS = ("id", "user_id", "weight_kg", "date", "created_at")
+_WEIGHT_COLUMNS = ", ".join(_WEIGHT_FIELDS)
+
+_SQL_GET_USER = "SELECT id, username, email, role, created_at FROM users WHERE id = ?"
+_SQL_DASHBOARD_STATS = """
+    SELECT u.username,
+           (SELECT COUNT(*) FROM workouts w WHERE w.user_id = u.id) AS total_workouts,
+           (SELECT COALESCE(SUM(w.calories_burned), 0) FROM workouts w WHERE w.user_id = u.id)
+               AS total_calories_burned,
+           (SELECT COALESCE(SUM(n.calories), 0) FROM nutrition n WHERE n.user_id = u.id)
+               AS total_calories_consumed
+    FROM users u
+    WHERE u.id = ?
+"""
+# created_at is stamped by SQLite in the same UTC ISO-8601 format the API has always returned.
+_SQL_INSERT_WEIGHT_ROW = """
+    INSERT INTO weights (user_id, weight_kg, date, created_at)
+    VALUES (?, ?, ?, strftime('%Y-%m-%dT%H:%M:%S', 'now'))
+"""
+_SQL_INSERT_WEIGHT = f"{_SQL_INSERT_WEIGHT_ROW} RETURNING {_WEIGHT_COLUMNS}"
+# One fixed WHERE clause per (has start_date, has end_date) combination.
+_WEIGHT_FILTERS = {
+    (has_start, has_end): "user_id = ?"
+    + (" AND date >= ?" if has_start else "")
+    + (" AND date <= ?" if has_end else "")
+    for has_start in (False, True)
+    for has_end in (False, True)
+}
+_SQL_LIST_WEIGHTS = {
+    key: f"""
+        SELECT {{columns}}
+        FROM weights
+        WHERE {where}
+        ORDER BY date ASC, id ASC
+        LIMIT ? OFFSET ?
+    """
+    for key, where in _WEIGHT_FILTERS.items()
+}
+_SQL_UPDATE_WEIGHT = f"""
+    UPDATE weights
+    SET weight_kg = COALESCE(?, weight_kg),
+        date = COALESCE(?, date)
+    WHERE id = ? AND user_id = ?
+    RETURNING {_WEIGHT_COLUMNS}
+"""
+_SQL_DELETE_WEIGHT = "DELETE FROM weights WHERE id = ? AND user_id = ?"
 
 
 class UserService:
@@ -16,11 +65,7 @@ class UserService:
         self.db = db_manager
 
     def get_user_by_id(self, user_id: int) -> dict:
-        user = self.db.execute(
-            "SELECT id, username, email, role, created_at FROM users WHERE id = ?",
-            (user_id,),
-            fetchone=True,
-        )
+        user = self.db.execute(_SQL_GET_USER, (user_id,), fetchone=True)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -29,57 +74,34 @@ class UserService:
         return user
 
     def get_dashboard_stats(self, user_id: int) -> dict:
-        user = self.get_user_by_id(user_id)
-
-        workout_stats = self.db.execute(
-            """
-            SELECT COUNT(*) AS total_workouts,
-                   COALESCE(SUM(calories_burned), 0) AS total_calories_burned
-            FROM workouts
-            WHERE user_id = ?
-            """,
-            (user_id,),
-            fetchone=True,
-        )
-
-        meal_stats = self.db.execute(
-            """
-            SELECT COALESCE(SUM(calories), 0) AS total_calories_consumed
-            FROM nutrition
-            WHERE user_id = ?
-            """,
-            (user_id,),
-            fetchone=True,
-        )
+        stats = self.db.execute(_SQL_DASHBOARD_STATS, (user_id,), fetchone=True)
+        if not stats:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found.",
+            )
+        return stats
 
+    def get_dashboard_full(self, user_id: int, days: int = 30) -> dict:
+        """Dashboard stats plus per-day calorie totals for the last ``days`` days."""
         return {
-            "username": user["username"],
-            "total_workouts": int(workout_stats["total_workouts"]),
-            "total_calories_burned": int(workout_stats["total_calories_burned"]),
-            "total_calories_consumed": int(meal_stats["total_calories_consumed"]),
+            "stats": self.get_dashboard_stats(user_id),
+            "daily_calories_burned": WorkoutService(self.db).get_daily_calories_burned(user_id, days),
+            "daily_calories_consumed": NutritionService(self.db).get_daily_calories_consumed(user_id, days),
         }
 
     def add_weight_entry(self, user_id: int, payload: WeightCreate) -> dict:
-        now = datetime.utcnow().isoformat(timespec="seconds")
-        self.db.execute(
-            """
-            INSERT INTO weights (user_id, weight_kg, date, created_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (user_id, payload.weight_kg, payload.date.isoformat(), now),
+        return self.db.execute(
+            _SQL_INSERT_WEIGHT,
+            (user_id, payload.weight_kg, payload.date.isoformat()),
+            fetchone=True,
             commit=True,
         )
 
-        return self.db.execute(
-            """
-            SELECT id, user_id, weight_kg, date, created_at
-            FROM weights
-            WHERE user_id = ?
-            ORDER BY id DESC
-            LIMIT 1
-            """,
-            (user_id,),
-            fetchone=True,
+    def add_weight_entries_bulk(self, user_id: int, payloads: list[WeightCreate]) -> int:
+        return self.db.execute_many(
+            _SQL_INSERT_WEIGHT_ROW,
+            ((user_id, payload.weight_kg, payload.date.isoformat()) for payload in payloads),
         )
 
     def list_weight_entries(
@@ -87,72 +109,40 @@ class UserService:
         user_id: int,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[str] = None,
     ) -> list[dict]:
-        conditions = ["user_id = ?"]
-        params: list[object] = [user_id]
-
-        if start_date:
-            conditions.append("date >= ?")
-            params.append(start_date)
-        if end_date:
-            conditions.append("date <= ?")
-            params.append(end_date)
-
-        query = f"""
-            SELECT id, user_id, weight_kg, date, created_at
-            FROM weights
-            WHERE {' AND '.join(conditions)}
-            ORDER BY date ASC, id ASC
-        """
-        return self.db.execute(query, params, fetchall=True) or []
+        """Return the user's weight entries, oldest first, within the date range."""
+        columns = select_columns(fields, _WEIGHT_FIELDS)
+        key, params = filter_params(user_id, start_date, end_date)
+        params.extend([-1 if limit is None else limit, offset])
+        return self.db.execute(_SQL_LIST_WEIGHTS[key].format(columns=columns), params, fetchall=True)
 
     def update_weight_entry(self, user_id: int, weight_id: int, payload: WeightUpdate) -> dict:
-        existing = self.db.execute(
-            "SELECT id, user_id, weight_kg, date, created_at FROM weights WHERE id = ? AND user_id = ?",
-            (weight_id, user_id),
+        # COALESCE keeps the stored value for every field left out of the payload.
+        updated = self.db.execute(
+            _SQL_UPDATE_WEIGHT,
+            (
+                payload.weight_kg,
+                payload.date.isoformat() if payload.date else None,
+                weight_id,
+                user_id,
+            ),
             fetchone=True,
+            commit=True,
         )
-        if not existing:
+        if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Weight entry not found.",
             )
-
-        update_fields = payload.model_dump(exclude_none=True)
-        if not update_fields:
-            return existing
-
-        set_clauses = []
-        values: list[object] = []
-        for key, value in update_fields.items():
-            set_clauses.append(f"{key} = ?")
-            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
-
-        values.extend([weight_id, user_id])
-        query = f"UPDATE weights SET {', '.join(set_clauses)} WHERE id = ? AND user_id = ?"
-
-        self.db.execute(query, values, commit=True)
-
-        return self.db.execute(
-            "SELECT id, user_id, weight_kg, date, created_at FROM weights WHERE id = ? AND user_id = ?",
-            (weight_id, user_id),
-            fetchone=True,
-        )
+        return updated
 
     def delete_weight_entry(self, user_id: int, weight_id: int) -> None:
-        existing = self.db.execute(
-            "SELECT id FROM weights WHERE id = ? AND user_id = ?",
-            (weight_id, user_id),
-            fetchone=True,
-        )
-        if not existing:
+        deleted = self.db.execute_write(_SQL_DELETE_WEIGHT, (weight_id, user_id))
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Weight entry not found.",
             )
-
-        self.db.execute(
-            "DELETE FROM weights WHERE id = ? AND user_id = ?",
-            (weight_id, user_id),
-            commit=True,
-        )
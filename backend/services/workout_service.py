@@ -1,13 +1,86 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
 from typing import Optional
 
 from fastapi import HTTPException, status
 
-from database import DatabaseManager
+from cache import cached_aggregate, forget_aggregates
+from database import DatabaseManager, filter_params
+from projection import select_columns
 from schemas import WorkoutCreate, WorkoutUpdate
 
+_WORKOUT_FIELDS = ("id", "user_id", "workout_name", "duration_minutes", "calories_burned", "date")
+_WORKOUT_COLUMNS = ", ".join(_WORKOUT_FIELDS)
+
+# One fixed WHERE clause per (has start_date, has end_date, has search) combination.
+_WORKOUT_FILTERS = {
+    (has_start, has_end, has_search): "user_id = ?"
+    + (" AND date >= ?" if has_start else "")
+    + (" AND date <= ?" if has_end else "")
+    + (" AND instr(py_lower(workout_name), py_lower(?)) > 0" if has_search else "")
+    for has_start in (False, True)
+    for has_end in (False, True)
+    for has_search in (False, True)
+}
+_SQL_LIST_WORKOUTS = {
+    key: f"""
+        SELECT {{columns}}
+        FROM workouts
+        WHERE {where}
+        ORDER BY date DESC, id DESC
+        LIMIT ? OFFSET ?
+    """
+    for key, where in _WORKOUT_FILTERS.items()
+}
+_SQL_COUNT_WORKOUTS = {
+    key: f"SELECT COUNT(*) AS count FROM workouts WHERE {where}" for key, where in _WORKOUT_FILTERS.items()
+}
+_SQL_CALORIES_BURNED_BY_DATE = {
+    key: f"""
+        SELECT date, SUM(calories_burned) AS total
+        FROM workouts
+        WHERE {where}
+        GROUP BY date
+        ORDER BY date ASC
+    """
+    for key, where in _WORKOUT_FILTERS.items()
+}
+_SQL_INSERT_WORKOUT_ROW = """
+    INSERT INTO workouts (user_id, workout_name, duration_minutes, calories_burned, date)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_WORKOUT = f"{_SQL_INSERT_WORKOUT_ROW} RETURNING {_WORKOUT_COLUMNS}"
+_SQL_UPDATE_WORKOUT = f"""
+    UPDATE workouts
+    SET workout_name = COALESCE(?, workout_name),
+        duration_minutes = COALESCE(?, duration_minutes),
+        calories_burned = COALESCE(?, calories_burned),
+        date = COALESCE(?, date)
+    WHERE id = ? AND user_id = ?
+    RETURNING {_WORKOUT_COLUMNS}
+"""
+_SQL_DELETE_WORKOUT = "DELETE FROM workouts WHERE id = ? AND user_id = ?"
+_SQL_WEEKLY_CALORIES_BURNED = """
+    SELECT COALESCE(SUM(calories_burned), 0) AS weekly_calories
+    FROM workouts
+    WHERE user_id = ? AND date >= date('now', '-7 days')
+"""
+# week is a generated column indexed with user_id, so this is a covering index scan.
+_SQL_WORKOUT_FREQUENCY_BY_WEEK = """
+    SELECT week, COUNT(*) AS workout_count
+    FROM workouts
+    WHERE user_id = ?
+    GROUP BY week
+    ORDER BY week ASC
+"""
+_SQL_DAILY_CALORIES_BURNED = """
+    SELECT date, SUM(calories_burned) AS total
+    FROM workouts
+    WHERE user_id = ? AND date >= date('now', ?)
+    GROUP BY date
+    ORDER BY date ASC
+"""
+
 
 class WorkoutService:
     """Workout CRUD and workout analytics."""
@@ -20,31 +93,30 @@ class WorkoutService:
         user_id: int,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[str] = None,
     ) -> list[dict]:
-        conditions = ["user_id = ?"]
-        params: list[object] = [user_id]
-
-        if start_date:
-            conditions.append("date >= ?")
-            params.append(start_date)
-        if end_date:
-            conditions.append("date <= ?")
-            params.append(end_date)
-
-        query = f"""
-            SELECT id, user_id, workout_name, duration_minutes, calories_burned, date
-            FROM workouts
-            WHERE {' AND '.join(conditions)}
-            ORDER BY date DESC, id DESC
-        """
-        return self.db.execute(query, params, fetchall=True) or []
+        """Return the user's workouts, newest first, matching the filters."""
+        columns = select_columns(fields, _WORKOUT_FIELDS)
+        key, params = filter_params(user_id, start_date, end_date, search)
+        params.extend([-1 if limit is None else limit, offset])
+        return self.db.execute(_SQL_LIST_WORKOUTS[key].format(columns=columns), params, fetchall=True)
+
+    def count_workouts(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        key, params = filter_params(user_id, start_date, end_date, search)
+        return int(self.db.execute(_SQL_COUNT_WORKOUTS[key], params, fetchone=True)["count"])
 
     def add_workout(self, user_id: int, workout: WorkoutCreate) -> dict:
-        self.db.execute(
-            """
-            INSERT INTO workouts (user_id, workout_name, duration_minutes, calories_burned, date)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+        created = self.db.execute(
+            _SQL_INSERT_WORKOUT,
             (
                 user_id,
                 workout.workout_name,
@@ -52,102 +124,90 @@ class WorkoutService:
                 workout.calories_burned,
                 workout.date.isoformat(),
             ),
+            fetchone=True,
             commit=True,
         )
+        forget_aggregates(user_id)
+        return created
 
-        return self.db.execute(
-            """
-            SELECT id, user_id, workout_name, duration_minutes, calories_burned, date
-            FROM workouts
-            WHERE user_id = ?
-            ORDER BY id DESC
-            LIMIT 1
-            """,
-            (user_id,),
-            fetchone=True,
+    def add_workouts_bulk(self, user_id: int, workouts: list[WorkoutCreate]) -> int:
+        inserted = self.db.execute_many(
+            _SQL_INSERT_WORKOUT_ROW,
+            (
+                (
+                    user_id,
+                    workout.workout_name,
+                    workout.duration_minutes,
+                    workout.calories_burned,
+                    workout.date.isoformat(),
+                )
+                for workout in workouts
+            ),
         )
+        forget_aggregates(user_id)
+        return inserted
 
     def update_workout(self, user_id: int, workout_id: int, workout: WorkoutUpdate) -> dict:
-        existing = self.db.execute(
-            """
-            SELECT id, user_id, workout_name, duration_minutes, calories_burned, date
-            FROM workouts
-            WHERE id = ? AND user_id = ?
-            """,
-            (workout_id, user_id),
+        # COALESCE keeps the stored value for every field left out of the payload.
+        updated = self.db.execute(
+            _SQL_UPDATE_WORKOUT,
+            (
+                workout.workout_name,
+                workout.duration_minutes,
+                workout.calories_burned,
+                workout.date.isoformat() if workout.date else None,
+                workout_id,
+                user_id,
+            ),
             fetchone=True,
+            commit=True,
         )
-        if not existing:
+        if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Workout not found.",
             )
-
-        update_fields = workout.model_dump(exclude_none=True)
-        if not update_fields:
-            return existing
-
-        set_clauses = []
-        values: list[object] = []
-        for key, value in update_fields.items():
-            set_clauses.append(f"{key} = ?")
-            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
-
-        values.extend([workout_id, user_id])
-        query = f"UPDATE workouts SET {', '.join(set_clauses)} WHERE id = ? AND user_id = ?"
-
-        self.db.execute(query, values, commit=True)
-
-        return self.db.execute(
-            """
-            SELECT id, user_id, workout_name, duration_minutes, calories_burned, date
-            FROM workouts
-            WHERE id = ? AND user_id = ?
-            """,
-            (workout_id, user_id),
-            fetchone=True,
-        )
+        forget_aggregates(user_id)
+        return updated
 
     def delete_workout(self, user_id: int, workout_id: int) -> None:
-        existing = self.db.execute(
-            "SELECT id FROM workouts WHERE id = ? AND user_id = ?",
-            (workout_id, user_id),
-            fetchone=True,
-        )
-        if not existing:
+        deleted = self.db.execute_write(_SQL_DELETE_WORKOUT, (workout_id, user_id))
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Workout not found.",
             )
+        forget_aggregates(user_id)
 
-        self.db.execute(
-            "DELETE FROM workouts WHERE id = ? AND user_id = ?",
-            (workout_id, user_id),
-            commit=True,
+    def get_weekly_calories_burned(self, user_id: int) -> int:
+        def compute() -> int:
+            result = self.db.execute(_SQL_WEEKLY_CALORIES_BURNED, (user_id,), fetchone=True)
+            return int(result["weekly_calories"])
+
+        return cached_aggregate((user_id, "weekly_calories"), compute)
+
+    def get_workout_frequency_by_week(self, user_id: int) -> list[dict]:
+        return cached_aggregate(
+            (user_id, "weekly_frequency"),
+            lambda: self.db.execute(_SQL_WORKOUT_FREQUENCY_BY_WEEK, (user_id,), fetchall=True) or [],
         )
 
-    def get_weekly_calories_burned(self, user_id: int) -> int:
-        week_start = (date.today() - timedelta(days=7)).isoformat()
-        result = self.db.execute(
-            """
-            SELECT COALESCE(SUM(calories_burned), 0) AS weekly_calories
-            FROM workouts
-            WHERE user_id = ? AND date >= ?
-            """,
-            (user_id, week_start),
-            fetchone=True,
+    def get_daily_calories_burned(self, user_id: int, days: int = 90) -> list[dict]:
+        return cached_aggregate(
+            (user_id, "daily_calories_burned", days),
+            lambda: self.db.execute(_SQL_DAILY_CALORIES_BURNED, (user_id, f"-{days} days"), fetchall=True)
+            or [],
         )
-        return int(result["weekly_calories"])
 
-    def get_workout_frequency_by_week(self, user_id: int) -> list[dict]:
-        return self.db.execute(
-            """
-            SELECT strftime('%Y-W%W', date) AS week, COUNT(*) AS workout_count
-            FROM workouts
-            WHERE user_id = ?
-            GROUP BY strftime('%Y-W%W', date)
-            ORDER BY week ASC
-            """,
-            (user_id,),
-            fetchall=True,
-        ) or []
+    def get_calories_burned_by_date(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> list[dict]:
+        key, params = filter_params(user_id, start_date, end_date, search)
+        return cached_aggregate(
+            (user_id, "calories_burned_by_date", start_date, end_date, search),
+            lambda: self.db.execute(_SQL_CALORIES_BURNED_BY_DATE[key], params, fetchall=True) or [],
+        )
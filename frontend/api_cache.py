@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Sequence
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from api_client import APIClient
+
+GET_CACHE_TTL_SECONDS = 60
+
+
+class _FailedResponse(Exception):
+    """Raised inside the cached call so error responses are never memoized."""
+
+    def __init__(self, data: Any) -> None:
+        super().__init__()
+        self.data = data
+
+
+@st.cache_data(ttl=GET_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_get(
+    _client: APIClient,
+    base_url: str,
+    token: str,
+    path: str,
+    params: Optional[tuple[tuple[str, Any], ...]],
+) -> Any:
+    # _client is excluded from the cache key; base_url and token identify the caller.
+    ok, data = _client.get(path, params=dict(params) if params else None)
+    if not ok:
+        raise _FailedResponse(data)
+    return data
+
+
+@st.cache_data(ttl=GET_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_csv(
+    _client: APIClient,
+    base_url: str,
+    token: str,
+    path: str,
+    params: Optional[tuple[tuple[str, Any], ...]],
+) -> bytes:
+    import pandas as pd
+
+    rows = _cached_get(_client, base_url, token, path, params)
+    return pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+
+
+def cached_get(
+    client: APIClient,
+    path: str,
+    params: Optional[dict[str, Any]] = None,
+) -> tuple[bool, Any]:
+    """Same contract as ``APIClient.get`` but serves repeated identical requests from memory."""
+    key_params = tuple(sorted(params.items())) if params else None
+    try:
+        return True, _cached_get(client, client.base_url, client.token or "", path, key_params)
+    except _FailedResponse as exc:
+        return False, exc.data
+
+
+def cached_get_many(
+    client: APIClient,
+    requests: Sequence[tuple[str, Optional[dict[str, Any]]]],
+) -> list[tuple[bool, Any]]:
+    """Run several independent ``cached_get`` calls concurrently and return results in input order."""
+    # Workers inherit the script context so st.cache_data behaves as it does on the main thread.
+    with ThreadPoolExecutor(
+        max_workers=4,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx()),
+    ) as executor:
+        return list(executor.map(lambda request: cached_get(client, *request), requests))
+
+
+def cached_csv(
+    client: APIClient,
+    path: str,
+    params: Optional[dict[str, Any]] = None,
+) -> tuple[bool, Any]:
+    """Like ``cached_get`` but returns the rows encoded as CSV bytes, re-encoded only when they change."""
+    key_params = tuple(sorted(params.items())) if params else None
+    try:
+        return True, _cached_csv(client, client.base_url, client.token or "", path, key_params)
+    except _FailedResponse as exc:
+        return False, exc.data
+
+
+def clear_cached_gets() -> None:
+    """Drop cached responses after a write so the next render sees fresh data."""
+    _cached_get.clear()
+    _cached_csv.clear()
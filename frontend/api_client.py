@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class APIClient:
@@ -10,20 +13,34 @@ class APIClient:
 
     def __init__(self, base_url: str, token: Optional[str] = None, timeout: int = 15) -> None:
         self.base_url = base_url.rstrip("/")
-        self.token = token
         self.timeout = timeout
 
+        # One keep-alive session per client instead of a new connection per call.
+        self._session = requests.Session()
+        self._session.headers["Content-Type"] = "application/json"
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self.token: Optional[str] = None
+        if token:
+            self.set_token(token)
+
     def set_token(self, token: str) -> None:
         self.token = token
+        self._session.headers["Authorization"] = f"Bearer {token}"
 
     def clear_token(self) -> None:
         self.token = None
+        self._session.headers.pop("Authorization", None)
 
-    def _headers(self) -> dict[str, str]:
-        headers = {"Content-Type": "application/json"}
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        return headers
+    def close(self) -> None:
+        """Close the keep-alive connections held by this client's session."""
+        self._session.close()
 
     def _request(
         self,
@@ -34,19 +51,19 @@ class APIClient:
     ) -> tuple[bool, Any]:
         url = f"{self.base_url}{path}"
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                json=payload,
+                # The session already sends Content-Type: application/json.
+                data=orjson.dumps(payload) if payload is not None else None,
                 params=params,
-                headers=self._headers(),
                 timeout=self.timeout,
             )
         except requests.RequestException as exc:
             return False, {"detail": f"Could not connect to API: {exc}"}
 
         try:
-            data = response.json() if response.text else {}
+            data = orjson.loads(response.content) if response.content else {}
         except ValueError:
             data = {"detail": response.text or "Unknown response"}
 
@@ -4,6 +4,12 @@ import streamlit as st
 
 from api_client import APIClient
 from pages import dashboard, login, nutrition, progress, workouts
+from session import get_client, logout
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _health(base_url: str) -> bool:
+    return APIClient(base_url).get("/")[0]
 
 
 def initialize_session_state() -> None:
@@ -17,16 +23,7 @@ def initialize_session_state() -> None:
         "current_page": "Login / Register",
     }
     for key, value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
-
-
-def clear_auth_state() -> None:
-    st.session_state.authenticated = False
-    st.session_state.token = ""
-    st.session_state.username = ""
-    st.session_state.user_id = None
-    st.session_state.current_page = "Login / Register"
+        st.session_state.setdefault(key, value)
 
 
 def apply_theme() -> None:
@@ -55,9 +52,8 @@ def main() -> None:
     st.session_state.dark_mode = st.sidebar.toggle("Dark Mode", value=st.session_state.dark_mode)
     apply_theme()
 
-    client = APIClient(st.session_state.api_base_url, st.session_state.token)
-    health_ok, _ = client.get("/")
-    if health_ok:
+    client = get_client(st.session_state.api_base_url, st.session_state.token)
+    if _health(st.session_state.api_base_url):
         st.sidebar.caption("API: Connected")
     else:
         st.sidebar.caption("API: Disconnected")
@@ -81,8 +77,7 @@ def main() -> None:
     st.session_state.current_page = selected_page
 
     if st.session_state.authenticated and st.sidebar.button("Logout", use_container_width=True):
-        client.post("/logout")
-        clear_auth_state()
+        logout(client)
         st.rerun()
 
     if selected_page == "Login / Register":
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def daily_series(daily_totals: list[dict]) -> pd.Series:
+    """Turn the API's pre-aggregated (date, total) rows into a date-indexed series."""
+    # Imported here so reruns without chart data never pay for loading pandas.
+    import pandas as pd
+
+    # Two flat arrays are all the chart needs; no intermediate DataFrame is built.
+    return pd.Series(
+        [row["total"] for row in daily_totals],
+        index=pd.to_datetime([row["date"] for row in daily_totals], format="%Y-%m-%d", cache=True),
+        name="total",
+        dtype="int64",
+    )
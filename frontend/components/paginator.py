@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Sequence, TypeVar
+
+import streamlit as st
+
+T = TypeVar("T")
+
+PAGE_SIZES = [5, 10, 20]
+
+
+def page_window(total_rows: int, key_prefix: str) -> tuple[int, int]:
+    """Render the rows-per-page and page controls and return ``(offset, limit)`` for the chosen page."""
+    page_key = f"{key_prefix}_page"
+    page_size_col, page_col = st.columns(2)
+    page_size = page_size_col.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key_prefix}_page_size")
+    total_pages = max(1, -(-total_rows // page_size))
+
+    if st.session_state.setdefault(page_key, 1) > total_pages:
+        st.session_state[page_key] = total_pages
+
+    current_page = int(
+        page_col.number_input(
+            "Page",
+            min_value=1,
+            max_value=total_pages,
+            value=int(st.session_state[page_key]),
+            step=1,
+            key=page_key,
+        )
+    )
+    return (current_page - 1) * page_size, page_size
+
+
+def page_caption(offset: int, limit: int, total_rows: int, noun: str) -> str:
+    return f"Showing {offset + 1}-{min(offset + limit, total_rows)} of {total_rows} {noun}."
+
+
+def paginate(records: Sequence[T], key_prefix: str, noun: str) -> tuple[Sequence[T], str]:
+    """Client-side variant of ``page_window`` for records that are already loaded."""
+    offset, limit = page_window(len(records), key_prefix)
+    return records[offset:offset + limit], page_caption(offset, limit, len(records), noun)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Optional, Sequence
+
+import streamlit as st
+
+from api_client import APIClient
+
+_DELETE_COLUMN = "delete"
+
+
+def _payload_value(value: Any, single_precision: bool = False) -> Any:
+    if single_precision:
+        # float32 cells widen to e.g. 30.200000762939453; 7 significant digits recover what was typed.
+        return float(f"{value:.7g}")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def edit_rows(
+    rows: list[dict],
+    key: str,
+    column_config: dict[str, Any],
+    dtypes: Optional[dict[str, str]] = None,
+) -> tuple[list[tuple[int, dict[str, Any]]], list[int]]:
+    """Render ``rows`` in one data editor and return the ``(updates, deletions)`` the user made.
+
+    Every column named in ``column_config`` is editable; ``id`` is shown read-only and a
+    checkbox column marks rows for deletion. ``dtypes`` narrows numeric columns before the
+    frame is sent to the browser. Updates only carry the fields that changed.
+    """
+    import pandas as pd
+
+    editable = list(column_config)
+    frame = pd.DataFrame(rows, columns=["id", *editable])
+    if dtypes:
+        frame = frame.astype(dtypes)
+    float32_columns = set(frame.select_dtypes("float32").columns)
+    if "date" in frame:
+        frame["date"] = pd.to_datetime(frame["date"], format="%Y-%m-%d", cache=True).dt.date
+    frame[_DELETE_COLUMN] = False
+
+    # Pending edits are positional, so a different set of rows must not inherit them.
+    edited = st.data_editor(
+        frame,
+        key=f"{key}_{hash(tuple(frame['id']))}",
+        hide_index=True,
+        use_container_width=True,
+        disabled=["id"],
+        column_config={**column_config, _DELETE_COLUMN: st.column_config.CheckboxColumn("Delete")},
+    )
+
+    updates: list[tuple[int, dict[str, Any]]] = []
+    deletions: list[int] = []
+    for before, after in zip(frame.to_dict("records"), edited.to_dict("records")):
+        if after[_DELETE_COLUMN]:
+            deletions.append(before["id"])
+            continue
+        changed = {
+            field: _payload_value(after[field], field in float32_columns)
+            for field in editable
+            if after[field] != before[field]
+        }
+        if changed:
+            updates.append((before["id"], changed))
+    return updates, deletions
+
+
+def clear_edits(key: str) -> None:
+    """Forget pending edits for every row set rendered under ``key``."""
+    for state_key in [k for k in st.session_state if str(k).startswith(f"{key}_")]:
+        del st.session_state[state_key]
+
+
+def save_edits(
+    client: APIClient,
+    path: str,
+    updates: Sequence[tuple[int, dict[str, Any]]],
+    deletions: Sequence[int],
+) -> list[str]:
+    """Send the editor's updates and deletions over the client's session; return any error details."""
+    errors = []
+    for row_id, payload in updates:
+        ok, data = client.put(f"{path}/{row_id}", payload)
+        if not ok:
+            errors.append(f"#{row_id}: {data.get('detail', 'Update failed.')}")
+    for row_id in deletions:
+        ok, data = client.delete(f"{path}/{row_id}")
+        if not ok:
+            errors.append(f"#{row_id}: {data.get('detail', 'Delete failed.')}")
+    return errors
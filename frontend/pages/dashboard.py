@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-import pandas as pd
+import bisect
+
 import streamlit as st
 
+from api_cache import cached_get
 from api_client import APIClient
+from components.charts import daily_series
+from session import logout
+
+BMI_THRESHOLDS = (18.5, 25.0, 30.0)
+BMI_CATEGORIES = ("Underweight", "Normal", "Overweight", "Obese")
 
 
 def render(client: APIClient) -> None:
@@ -11,11 +18,16 @@ def render(client: APIClient) -> None:
         st.warning("Please log in first.")
         return
 
-    ok, dashboard_data = client.get("/dashboard")
+    # Shared GET cache: BMI widget reruns reuse it and every write elsewhere invalidates it.
+    ok, full_data = cached_get(client, "/dashboard/full")
     if not ok:
-        st.error(dashboard_data.get("detail", "Could not load dashboard."))
+        st.error(full_data.get("detail", "Could not load dashboard."))
         return
 
+    dashboard_data = full_data["stats"]
+    burned_data = full_data["daily_calories_burned"]
+    consumed_data = full_data["daily_calories_consumed"]
+
     st.title("Dashboard")
     st.write(f"Welcome back, **{dashboard_data['username']}**")
 
@@ -30,46 +42,26 @@ def render(client: APIClient) -> None:
     weight_kg = bmi_col2.number_input("Weight (kg)", min_value=20.0, max_value=350.0, value=70.0, step=0.1)
 
     bmi = weight_kg / ((height_cm / 100) ** 2)
-    category = "Normal"
-    if bmi < 18.5:
-        category = "Underweight"
-    elif bmi >= 30:
-        category = "Obese"
-    elif bmi >= 25:
-        category = "Overweight"
+    category = BMI_CATEGORIES[bisect.bisect_right(BMI_THRESHOLDS, bmi)]
 
     st.metric("BMI", f"{bmi:.2f}", category)
 
-    workouts_ok, workouts_data = client.get("/workouts")
-    meals_ok, meals_data = client.get("/meals")
-
     chart_col1, chart_col2 = st.columns(2)
 
     with chart_col1:
         st.subheader("Calories Burned by Date")
-        if workouts_ok and workouts_data:
-            workout_df = pd.DataFrame(workouts_data)
-            workout_df["date"] = pd.to_datetime(workout_df["date"])
-            burned_by_date = workout_df.groupby("date", as_index=True)["calories_burned"].sum().sort_index()
-            st.bar_chart(burned_by_date)
+        if burned_data:
+            st.bar_chart(daily_series(burned_data))
         else:
             st.info("No workout data yet.")
 
     with chart_col2:
         st.subheader("Calories Consumed by Date")
-        if meals_ok and meals_data:
-            meal_df = pd.DataFrame(meals_data)
-            meal_df["date"] = pd.to_datetime(meal_df["date"])
-            consumed_by_date = meal_df.groupby("date", as_index=True)["calories"].sum().sort_index()
-            st.line_chart(consumed_by_date)
+        if consumed_data:
+            st.line_chart(daily_series(consumed_data))
         else:
             st.info("No nutrition data yet.")
 
     if st.button("Logout from Dashboard"):
-        client.post("/logout")
-        st.session_state.authenticated = False
-        st.session_state.token = ""
-        st.session_state.username = ""
-        st.session_state.user_id = None
-        st.session_state.current_page = "Login / Register"
+        logout(client)
         st.rerun()
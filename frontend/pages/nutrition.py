@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
-from math import ceil
 
-import matplotlib.pyplot as plt
-import pandas as pd
 import streamlit as st
 
+from api_cache import cached_get, cached_get_many, clear_cached_gets
 from api_client import APIClient
+from components.charts import daily_series
+from components.paginator import page_caption, page_window
+from components.table_editor import clear_edits, edit_rows, save_edits
+
+# Narrow numeric dtypes for the history table; they also shrink the Arrow payload sent to the browser.
+_TABLE_DTYPES = {"calories": "int32", "protein": "float32", "carbs": "float32", "fats": "float32"}
+_MACRO_FIELDS = (("Protein", "total_protein"), ("Carbs", "total_carbs"), ("Fats", "total_fats"))
 
 
 def render(client: APIClient) -> None:
@@ -42,32 +47,41 @@ def render(client: APIClient) -> None:
                 ok, data = client.post("/meals", payload)
                 if ok:
                     st.success("Meal added successfully.")
+                    clear_cached_gets()
                     st.rerun()
                 else:
                     st.error(data.get("detail", "Could not add meal."))
 
     st.subheader("Daily Macro Breakdown")
     macro_date = st.date_input("Select Date", value=date.today(), key="macro_date")
-    macros_ok, macros_data = client.get("/meals/macros", params={"date": macro_date.isoformat()})
+    macros_ok, macros_data = cached_get(client, "/meals/macros", params={"date": macro_date.isoformat()})
 
     if macros_ok:
-        macro_col1, macro_col2, macro_col3, macro_col4 = st.columns(4)
-        macro_col1.metric("Protein (g)", f"{macros_data['total_protein']:.1f}")
-        macro_col2.metric("Carbs (g)", f"{macros_data['total_carbs']:.1f}")
-        macro_col3.metric("Fats (g)", f"{macros_data['total_fats']:.1f}")
-        macro_col4.metric("Calories", macros_data["total_calories"])
-
-        values = [
-            macros_data["total_protein"],
-            macros_data["total_carbs"],
-            macros_data["total_fats"],
-        ]
-
-        if sum(values) > 0:
-            fig, ax = plt.subplots()
-            ax.pie(values, labels=["Protein", "Carbs", "Fats"], autopct="%1.1f%%", startangle=90)
-            ax.axis("equal")
-            st.pyplot(fig)
+        *macro_cols, calories_col = st.columns(4)
+        grams = [float(macros_data[key]) for _, key in _MACRO_FIELDS]
+        for column, (label, _), value in zip(macro_cols, _MACRO_FIELDS, grams):
+            column.metric(f"{label} (g)", f"{value:.1f}")
+        calories_col.metric("Calories", macros_data["total_calories"])
+
+        total_grams = sum(grams)
+        if total_grams > 0:
+            # Altair ships with Streamlit and renders client-side, so no figure is rasterized per rerun.
+            import altair as alt
+            import pandas as pd
+
+            macro_df = pd.DataFrame(
+                {
+                    "macro": [label for label, _ in _MACRO_FIELDS],
+                    "grams": grams,
+                    "share": [value / total_grams for value in grams],
+                }
+            )
+            pie = alt.Chart(macro_df).mark_arc().encode(
+                theta=alt.Theta("grams:Q"),
+                color=alt.Color("macro:N", title="Macro"),
+                tooltip=["macro:N", alt.Tooltip("grams:Q", format=".1f"), alt.Tooltip("share:Q", format=".1%")],
+            )
+            st.altair_chart(pie, use_container_width=True)
         else:
             st.info("No macro data for the selected date.")
     else:
@@ -80,118 +94,71 @@ def render(client: APIClient) -> None:
     search_text = filter_col3.text_input("Search Meals", placeholder="e.g. Oatmeal")
 
     params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
-    ok, meals_data = client.get("/meals", params=params)
+    if search_text:
+        params["search"] = search_text
 
+    (ok, count_data), (trend_ok, trend_data) = cached_get_many(
+        client,
+        [("/meals/count", params), ("/meals/daily-calories", params)],
+    )
     if not ok:
-        st.error(meals_data.get("detail", "Could not load meals."))
+        st.error(count_data.get("detail", "Could not load meals."))
         return
 
-    if search_text:
-        meals_data = [row for row in meals_data if search_text.lower() in row["meal_name"].lower()]
-
-    if not meals_data:
+    total_rows = count_data["count"]
+    if not total_rows:
         st.info("No meals found for the selected filters.")
         return
 
-    meal_df = pd.DataFrame(meals_data)
-    meal_df["date"] = pd.to_datetime(meal_df["date"])
-
     st.subheader("Calories Consumed Trend")
-    calories_by_date = meal_df.groupby("date", as_index=True)["calories"].sum().sort_index()
-    st.line_chart(calories_by_date)
-
-    total_rows = len(meals_data)
-    page_size_col, page_col = st.columns(2)
-    page_size = page_size_col.selectbox("Rows per page", [5, 10, 20], index=1, key="meal_page_size")
-    total_pages = max(1, ceil(total_rows / page_size))
-
-    if "meal_page" not in st.session_state:
-        st.session_state.meal_page = 1
-    if st.session_state.meal_page > total_pages:
-        st.session_state.meal_page = total_pages
-
-    current_page = int(
-        page_col.number_input(
-            "Page",
-            min_value=1,
-            max_value=total_pages,
-            value=int(st.session_state.meal_page),
-            step=1,
-            key="meal_page",
-        )
-    )
+    if trend_ok and trend_data:
+        st.line_chart(daily_series(trend_data))
 
-    start_idx = (current_page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_meals = meals_data[start_idx:end_idx]
-    st.caption(f"Showing {start_idx + 1}-{min(end_idx, total_rows)} of {total_rows} meal records.")
-    st.dataframe(pd.DataFrame(paginated_meals), use_container_width=True)
+    _meal_history(client, params, total_rows)
+
+
+# A fragment, so paging and table edits rerun only this section and leave the charts above untouched.
+@st.fragment
+def _meal_history(client: APIClient, params: dict[str, str], total_rows: int) -> None:
+    offset, page_size = page_window(total_rows, "meal")
+    ok, paginated_meals = cached_get(
+        client,
+        "/meals",
+        params={**params, "limit": page_size, "offset": offset},
+    )
+    if not ok:
+        st.error(paginated_meals.get("detail", "Could not load meals."))
+        return
+    # The count and the page are cached separately, so the offset can briefly point past the last row.
+    if not paginated_meals:
+        st.info("No meals on this page.")
+        return
 
     st.subheader("Edit / Delete Meals")
-    for meal in paginated_meals:
-        meal_id = meal["id"]
-        label = f"{meal['date']} | {meal['meal_name']} ({meal['calories']} kcal)"
-        with st.expander(label):
-            with st.form(f"edit_meal_{meal_id}"):
-                edit_name = st.text_input("Meal Name", value=meal["meal_name"], key=f"meal_name_{meal_id}")
-                edit_calories = st.number_input(
-                    "Calories",
-                    min_value=0,
-                    max_value=10000,
-                    value=int(meal["calories"]),
-                    key=f"meal_calories_{meal_id}",
-                )
-                edit_protein = st.number_input(
-                    "Protein (g)",
-                    min_value=0.0,
-                    max_value=1000.0,
-                    value=float(meal["protein"]),
-                    key=f"meal_protein_{meal_id}",
-                )
-                edit_carbs = st.number_input(
-                    "Carbs (g)",
-                    min_value=0.0,
-                    max_value=1000.0,
-                    value=float(meal["carbs"]),
-                    key=f"meal_carbs_{meal_id}",
-                )
-                edit_fats = st.number_input(
-                    "Fats (g)",
-                    min_value=0.0,
-                    max_value=1000.0,
-                    value=float(meal["fats"]),
-                    key=f"meal_fats_{meal_id}",
-                )
-                edit_date = st.date_input(
-                    "Date",
-                    value=date.fromisoformat(meal["date"]),
-                    key=f"meal_date_{meal_id}",
-                )
-                save_submitted = st.form_submit_button("Save Changes")
-
-            if save_submitted:
-                if not edit_name.strip():
-                    st.error("Meal name is required.")
-                else:
-                    payload = {
-                        "meal_name": edit_name.strip(),
-                        "calories": int(edit_calories),
-                        "protein": float(edit_protein),
-                        "carbs": float(edit_carbs),
-                        "fats": float(edit_fats),
-                        "date": edit_date.isoformat(),
-                    }
-                    update_ok, update_data = client.put(f"/meals/{meal_id}", payload)
-                    if update_ok:
-                        st.success("Meal updated.")
-                        st.rerun()
-                    else:
-                        st.error(update_data.get("detail", "Update failed."))
-
-            if st.button("Delete Meal", key=f"delete_meal_{meal_id}"):
-                delete_ok, delete_data = client.delete(f"/meals/{meal_id}")
-                if delete_ok:
-                    st.success("Meal deleted.")
-                    st.rerun()
-                else:
-                    st.error(delete_data.get("detail", "Delete failed."))
+    st.caption(page_caption(offset, page_size, total_rows, "meal records"))
+    updates, deletions = edit_rows(
+        paginated_meals,
+        "meal_editor",
+        {
+            "meal_name": st.column_config.TextColumn("Meal Name", required=True, max_chars=100),
+            "calories": st.column_config.NumberColumn(
+                "Calories", required=True, min_value=0, max_value=10000, step=1
+            ),
+            "protein": st.column_config.NumberColumn(
+                "Protein (g)", required=True, min_value=0.0, max_value=1000.0
+            ),
+            "carbs": st.column_config.NumberColumn("Carbs (g)", required=True, min_value=0.0, max_value=1000.0),
+            "fats": st.column_config.NumberColumn("Fats (g)", required=True, min_value=0.0, max_value=1000.0),
+            "date": st.column_config.DateColumn("Date", required=True),
+        },
+        dtypes=_TABLE_DTYPES,
+    )
+    if (updates or deletions) and st.button("Save Changes", key="meal_save_edits"):
+        errors = save_edits(client, "/meals", updates, deletions)
+        clear_cached_gets()
+        if errors:
+            st.error("\n\n".join(errors))
+        else:
+            st.success("Meals updated.")
+            clear_edits("meal_editor")
+            st.rerun()
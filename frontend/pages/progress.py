@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
-from math import ceil
 
-import pandas as pd
 import streamlit as st
 
+from api_cache import cached_get_many, clear_cached_gets
 from api_client import APIClient
+from components.paginator import paginate
+from components.table_editor import clear_edits, edit_rows, save_edits
 
 
 def render(client: APIClient) -> None:
@@ -32,6 +33,7 @@ def render(client: APIClient) -> None:
             )
             if ok:
                 st.success("Weight entry saved.")
+                clear_cached_gets()
                 st.rerun()
             else:
                 st.error(data.get("detail", "Could not save weight entry."))
@@ -40,21 +42,29 @@ def render(client: APIClient) -> None:
     start_date = filter_col1.date_input("Start Date", value=date.today() - timedelta(days=90), key="weight_start")
     end_date = filter_col2.date_input("End Date", value=date.today(), key="weight_end")
 
-    ok, weights_data = client.get(
-        "/weights",
-        params={"start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+    (ok, weights_data), (freq_ok, freq_data) = cached_get_many(
+        client,
+        [
+            ("/weights", {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}),
+            ("/workouts/frequency", None),
+        ],
     )
     if not ok:
         st.error(weights_data.get("detail", "Could not load weight history."))
         return
 
+    # Imported here so loading the app does not pull pandas in before a page needs it.
+    import pandas as pd
+
     if weights_data:
         weights_df = pd.DataFrame(weights_data)
-        weights_df["date"] = pd.to_datetime(weights_df["date"])
+        weights_df["date"] = pd.to_datetime(weights_df["date"], format="%Y-%m-%d", cache=True)
         weights_df = weights_df.sort_values("date")
 
+        weight_series = weights_df.set_index("date")["weight_kg"]
+
         st.subheader("Weight History")
-        st.line_chart(weights_df.set_index("date")["weight_kg"])
+        st.line_chart(weight_series)
 
         height_cm = st.number_input(
             "Height for BMI Trend (cm)",
@@ -63,89 +73,45 @@ def render(client: APIClient) -> None:
             value=170.0,
             step=0.5,
         )
-        bmi_df = weights_df.copy()
-        bmi_df["bmi"] = bmi_df["weight_kg"] / ((height_cm / 100) ** 2)
+        # A standalone float32 series; no need to copy the whole frame for one derived column.
+        bmi = (weight_series.astype("float32") * (1.0 / (height_cm / 100) ** 2)).rename("bmi")
 
         st.subheader("BMI Trend")
-        st.line_chart(bmi_df.set_index("date")["bmi"])
+        st.line_chart(bmi)
 
         st.subheader("Weight Entries")
-        total_rows = len(weights_data)
-        page_size_col, page_col = st.columns(2)
-        page_size = page_size_col.selectbox("Rows per page", [5, 10, 20], index=1, key="weight_page_size")
-        total_pages = max(1, ceil(total_rows / page_size))
-
-        if "weight_page" not in st.session_state:
-            st.session_state.weight_page = 1
-        if st.session_state.weight_page > total_pages:
-            st.session_state.weight_page = total_pages
-
-        current_page = int(
-            page_col.number_input(
-                "Page",
-                min_value=1,
-                max_value=total_pages,
-                value=int(st.session_state.weight_page),
-                step=1,
-                key="weight_page",
-            )
-        )
-
-        start_idx = (current_page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_weights = weights_data[start_idx:end_idx]
-        st.caption(
-            f"Showing {start_idx + 1}-{min(end_idx, total_rows)} of {total_rows} weight entries."
-        )
-        st.dataframe(pd.DataFrame(paginated_weights), use_container_width=True)
-
-        for row in paginated_weights:
-            entry_id = row["id"]
-            with st.expander(f"{row['date']} | {row['weight_kg']} kg"):
-                with st.form(f"edit_weight_{entry_id}"):
-                    edit_weight = st.number_input(
-                        "Weight (kg)",
-                        min_value=20.0,
-                        max_value=500.0,
-                        value=float(row["weight_kg"]),
-                        step=0.1,
-                        key=f"weight_value_{entry_id}",
-                    )
-                    edit_date = st.date_input(
-                        "Date",
-                        value=date.fromisoformat(row["date"]),
-                        key=f"weight_date_{entry_id}",
-                    )
-                    save_submitted = st.form_submit_button("Save Changes")
-
-                if save_submitted:
-                    update_ok, update_data = client.put(
-                        f"/weights/{entry_id}",
-                        {
-                            "weight_kg": float(edit_weight),
-                            "date": edit_date.isoformat(),
-                        },
-                    )
-                    if update_ok:
-                        st.success("Weight entry updated.")
-                        st.rerun()
-                    else:
-                        st.error(update_data.get("detail", "Update failed."))
-
-                if st.button("Delete Entry", key=f"delete_weight_{entry_id}"):
-                    delete_ok, delete_data = client.delete(f"/weights/{entry_id}")
-                    if delete_ok:
-                        st.success("Weight entry deleted.")
-                        st.rerun()
-                    else:
-                        st.error(delete_data.get("detail", "Delete failed."))
+        _weight_entries(client, weights_data)
     else:
         st.info("No weight entries in the selected date range.")
 
     st.subheader("Workout Frequency per Week")
-    freq_ok, freq_data = client.get("/workouts/frequency")
     if freq_ok and freq_data:
         freq_df = pd.DataFrame(freq_data)
         st.bar_chart(freq_df.set_index("week")["workout_count"])
     else:
         st.info("No workout frequency data yet.")
+
+
+@st.fragment
+def _weight_entries(client: APIClient, weights_data: list[dict]) -> None:
+    paginated_weights, caption = paginate(weights_data, "weight", "weight entries")
+    st.caption(caption)
+    updates, deletions = edit_rows(
+        paginated_weights,
+        "weight_editor",
+        {
+            "weight_kg": st.column_config.NumberColumn(
+                "Weight (kg)", required=True, min_value=20.0, max_value=500.0, step=0.1
+            ),
+            "date": st.column_config.DateColumn("Date", required=True),
+        },
+    )
+    if (updates or deletions) and st.button("Save Changes", key="weight_save_edits"):
+        errors = save_edits(client, "/weights", updates, deletions)
+        clear_cached_gets()
+        if errors:
+            st.error("\n\n".join(errors))
+        else:
+            st.success("Weight entries updated.")
+            clear_edits("weight_editor")
+            st.rerun()
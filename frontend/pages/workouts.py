@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
-from math import ceil
 
-import pandas as pd
 import streamlit as st
 
+from api_cache import cached_csv, cached_get, cached_get_many, clear_cached_gets
 from api_client import APIClient
+from components.charts import daily_series
+from components.paginator import page_caption, page_window
+from components.table_editor import clear_edits, edit_rows, save_edits
+
+_TABLE_DTYPES = {"duration_minutes": "int32", "calories_burned": "int32"}
+_EXPORT_STATE_KEY = "workout_export_params"
 
 
 def render(client: APIClient) -> None:
@@ -16,9 +21,8 @@ def render(client: APIClient) -> None:
 
     st.title("Workouts")
 
-    weekly_ok, weekly_data = client.get("/workouts/weekly-calories")
-    if weekly_ok:
-        st.metric("Total Weekly Calories Burned", weekly_data.get("weekly_calories_burned", 0))
+    # Filled in once the filters are known, so its request can share a round-trip with theirs.
+    weekly_slot = st.empty()
 
     with st.expander("Add Workout", expanded=True):
         with st.form("add_workout_form"):
@@ -41,6 +45,7 @@ def render(client: APIClient) -> None:
                 ok, data = client.post("/workouts", payload)
                 if ok:
                     st.success("Workout added successfully.")
+                    clear_cached_gets()
                     st.rerun()
                 else:
                     st.error(data.get("detail", "Could not add workout."))
@@ -53,114 +58,96 @@ def render(client: APIClient) -> None:
     search_text = filter_col3.text_input("Search by Name", placeholder="e.g. Running")
 
     params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
-    ok, workouts_data = client.get("/workouts", params=params)
+    if search_text:
+        params["search"] = search_text
+
+    (weekly_ok, weekly_data), (ok, count_data), (trend_ok, trend_data) = cached_get_many(
+        client,
+        [
+            ("/workouts/weekly-calories", None),
+            ("/workouts/count", params),
+            ("/workouts/daily-calories", params),
+        ],
+    )
+    if weekly_ok:
+        weekly_slot.metric("Total Weekly Calories Burned", weekly_data.get("weekly_calories_burned", 0))
 
     if not ok:
-        st.error(workouts_data.get("detail", "Could not load workouts."))
+        st.error(count_data.get("detail", "Could not load workouts."))
         return
 
-    if search_text:
-        workouts_data = [
-            row for row in workouts_data if search_text.lower() in row["workout_name"].lower()
-        ]
-
-    if not workouts_data:
+    total_rows = count_data["count"]
+    if not total_rows:
         st.info("No workouts found for the selected filters.")
         return
 
-    workout_df = pd.DataFrame(workouts_data)
-    workout_df["date"] = pd.to_datetime(workout_df["date"])
-
     st.subheader("Calories Burned Trend")
-    calories_by_date = workout_df.groupby("date", as_index=True)["calories_burned"].sum().sort_index()
-    st.line_chart(calories_by_date)
-
-    total_rows = len(workouts_data)
-    page_size_col, page_col = st.columns(2)
-    page_size = page_size_col.selectbox("Rows per page", [5, 10, 20], index=1, key="workout_page_size")
-    total_pages = max(1, ceil(total_rows / page_size))
-
-    if "workout_page" not in st.session_state:
-        st.session_state.workout_page = 1
-    if st.session_state.workout_page > total_pages:
-        st.session_state.workout_page = total_pages
-
-    current_page = int(
-        page_col.number_input(
-            "Page",
-            min_value=1,
-            max_value=total_pages,
-            value=int(st.session_state.workout_page),
-            step=1,
-            key="workout_page",
-        )
-    )
+    if trend_ok and trend_data:
+        st.line_chart(daily_series(trend_data))
 
-    start_idx = (current_page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_workouts = workouts_data[start_idx:end_idx]
-    st.caption(
-        f"Showing {start_idx + 1}-{min(end_idx, total_rows)} of {total_rows} workout records."
-    )
-    st.dataframe(pd.DataFrame(paginated_workouts), use_container_width=True)
-
-    csv_data = workout_df.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "Export Workout History (CSV)",
-        data=csv_data,
-        file_name="workout_history.csv",
-        mime="text/csv",
+    _workout_history(client, params, total_rows)
+
+
+@st.fragment
+def _workout_history(client: APIClient, params: dict[str, str], total_rows: int) -> None:
+    offset, page_size = page_window(total_rows, "workout")
+    ok, paginated_workouts = cached_get(
+        client,
+        "/workouts",
+        params={**params, "limit": page_size, "offset": offset},
     )
+    if not ok:
+        st.error(paginated_workouts.get("detail", "Could not load workouts."))
+        return
+    if not paginated_workouts:
+        st.info("No workouts on this page.")
+        return
+
+    # The export covers every filtered row, so fetch the full history only when asked for.
+    # The filters it was prepared for are kept in session state, so the download button
+    # survives later reruns until it is used or the filters change.
+    if st.button("Prepare CSV Export"):
+        st.session_state[_EXPORT_STATE_KEY] = params
+    if st.session_state.get(_EXPORT_STATE_KEY) == params:
+        export_ok, export_data = cached_csv(client, "/workouts", params=params)
+        if export_ok:
+            st.download_button(
+                "Export Workout History (CSV)",
+                data=export_data,
+                file_name="workout_history.csv",
+                mime="text/csv",
+                on_click=_forget_export,
+            )
+        else:
+            st.error(export_data.get("detail", "Could not export workouts."))
 
     st.subheader("Edit / Delete Workouts")
-    for workout in paginated_workouts:
-        workout_id = workout["id"]
-        label = f"{workout['date']} | {workout['workout_name']} ({workout['calories_burned']} kcal)"
-        with st.expander(label):
-            with st.form(f"edit_workout_{workout_id}"):
-                edit_name = st.text_input("Workout Name", value=workout["workout_name"], key=f"name_{workout_id}")
-                edit_duration = st.number_input(
-                    "Duration (minutes)",
-                    min_value=1,
-                    max_value=600,
-                    value=int(workout["duration_minutes"]),
-                    key=f"duration_{workout_id}",
-                )
-                edit_calories = st.number_input(
-                    "Calories Burned",
-                    min_value=0,
-                    max_value=5000,
-                    value=int(workout["calories_burned"]),
-                    key=f"calories_{workout_id}",
-                )
-                edit_date = st.date_input(
-                    "Date",
-                    value=date.fromisoformat(workout["date"]),
-                    key=f"date_{workout_id}",
-                )
-                save_submitted = st.form_submit_button("Save Changes")
-
-            if save_submitted:
-                if not edit_name.strip():
-                    st.error("Workout name is required.")
-                else:
-                    payload = {
-                        "workout_name": edit_name.strip(),
-                        "duration_minutes": int(edit_duration),
-                        "calories_burned": int(edit_calories),
-                        "date": edit_date.isoformat(),
-                    }
-                    update_ok, update_data = client.put(f"/workouts/{workout_id}", payload)
-                    if update_ok:
-                        st.success("Workout updated.")
-                        st.rerun()
-                    else:
-                        st.error(update_data.get("detail", "Update failed."))
-
-            if st.button("Delete Workout", key=f"delete_workout_{workout_id}"):
-                delete_ok, delete_data = client.delete(f"/workouts/{workout_id}")
-                if delete_ok:
-                    st.success("Workout deleted.")
-                    st.rerun()
-                else:
-                    st.error(delete_data.get("detail", "Delete failed."))
+    st.caption(page_caption(offset, page_size, total_rows, "workout records"))
+    updates, deletions = edit_rows(
+        paginated_workouts,
+        "workout_editor",
+        {
+            "workout_name": st.column_config.TextColumn("Workout Name", required=True, max_chars=100),
+            "duration_minutes": st.column_config.NumberColumn(
+                "Duration (minutes)", required=True, min_value=1, max_value=600, step=1
+            ),
+            "calories_burned": st.column_config.NumberColumn(
+                "Calories Burned", required=True, min_value=0, max_value=5000, step=1
+            ),
+            "date": st.column_config.DateColumn("Date", required=True),
+        },
+        dtypes=_TABLE_DTYPES,
+    )
+    if (updates or deletions) and st.button("Save Changes", key="workout_save_edits"):
+        errors = save_edits(client, "/workouts", updates, deletions)
+        clear_cached_gets()
+        if errors:
+            st.error("\n\n".join(errors))
+        else:
+            st.success("Workouts updated.")
+            clear_edits("workout_editor")
+            st.rerun()
+
+
+def _forget_export() -> None:
+    st.session_state.pop(_EXPORT_STATE_KEY, None)
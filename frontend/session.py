@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import streamlit as st
+
+from api_client import APIClient
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_client(base_url: str, token: str) -> APIClient:
+    # Kept across reruns so its requests.Session reuses keep-alive connections.
+    return APIClient(base_url, token)
+
+
+def clear_auth_state() -> None:
+    st.session_state.authenticated = False
+    st.session_state.token = ""
+    st.session_state.username = ""
+    st.session_state.user_id = None
+    st.session_state.current_page = "Login / Register"
+
+
+def logout(client: APIClient) -> None:
+    """End the API session, then evict and close the cached client for this login only."""
+    client.post("/logout")
+    # Clearing with arguments drops just this (base_url, token) entry; other users keep theirs.
+    get_client.clear(st.session_state.api_base_url, st.session_state.token)
+    client.close()
+    clear_auth_state()